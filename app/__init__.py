@@ -6,10 +6,14 @@ configuration and testing. All Flask extensions are initialized here.
 """
 
 from flask import Flask
-from flask_cors import CORS
+import hashlib
+import importlib
 import logging
+import threading
 from datetime import datetime
 
+import redis
+
 from app.config import Config
 from app.extensions import (
     db,
@@ -20,31 +24,210 @@ from app.extensions import (
     csrf,
     limiter
 )
+from app.utils.cors import init_cors
+from app.utils.json_provider import ORJSONProvider
 from app.utils.logging import setup_logging
 
 
-def create_app(config_class=Config):
+# Blueprint import specs ("module:attribute") and their URL prefixes
+BLUEPRINTS = (
+    ('app.auth.routes:auth_bp', '/api/auth'),
+    ('app.companies.routes:companies_bp', '/api/companies'),
+    ('app.reports.routes:reports_bp', '/api/reports'),
+    ('app.dashboard.routes:dashboard_bp', '/api/dashboard'),
+    ('app.scheduling.routes:scheduling_bp', '/api/scheduling'),
+)
+
+# Model modules; every module must be imported before the mappers are
+# configured because relationships reference each other by class name
+MODEL_MODULES = (
+    'app.auth.models',
+    'app.companies.models',
+    'app.intelligence.models',
+    'app.reports.models',
+)
+
+
+def import_models():
+    """Import all model modules so their tables and mappers are registered."""
+    for module_name in MODEL_MODULES:
+        importlib.import_module(module_name)
+
+
+class LazyBlueprintLoader:
+    """
+    WSGI middleware that registers queued blueprints before the first request.
+    
+    Blueprint modules pull in services, HTTP clients and parsers, so importing
+    them is deferred from worker boot to the first request the app handles.
+    Registration happens before Flask dispatches that request, so the URL map
+    is complete by the time routing runs.
+    
+    Only used for the WSGI server entry point (wsgi.py). Anything that needs
+    the URL map without serving a request (CLI, url_for in a test request
+    context) must call load_blueprints(app) first.
+    """
+    
+    def __init__(self, app, wsgi_app):
+        self.app = app
+        self.wsgi_app = wsgi_app
+        self.pending = []
+        self.callbacks = []
+        self.loaded = False
+        self._lock = threading.Lock()
+    
+    def __call__(self, environ, start_response):
+        if not self.loaded:
+            self.load()
+        return self.wsgi_app(environ, start_response)
+    
+    def load(self):
+        """
+        Import and register every queued blueprint (runs once).
+        
+        Each blueprint and callback is dequeued as soon as it has run, so if
+        one raises, the next call resumes after the ones already registered
+        instead of registering them twice.
+        """
+        with self._lock:
+            if self.loaded:
+                return
+            
+            logger = logging.getLogger(__name__)
+            import_models()
+            
+            while self.pending:
+                import_spec, url_prefix = self.pending[0]
+                module_name, _, attribute = import_spec.partition(':')
+                try:
+                    blueprint = getattr(importlib.import_module(module_name), attribute)
+                    self.app.register_blueprint(blueprint, url_prefix=url_prefix)
+                except ImportError as e:
+                    logger.warning(f"Blueprint {import_spec} not available: {str(e)}")
+                self.pending.pop(0)
+            
+            while self.callbacks:
+                self.callbacks[0](self.app)
+                self.callbacks.pop(0)
+            
+            self.loaded = True
+
+
+def _get_loader(app):
+    """Return the app's LazyBlueprintLoader, installing it if needed."""
+    loader = app.wsgi_app
+    if not isinstance(loader, LazyBlueprintLoader):
+        loader = LazyBlueprintLoader(app, app.wsgi_app)
+        app.wsgi_app = loader
+    return loader
+
+
+def register_lazy(app, import_spec, url_prefix):
+    """
+    Queue a blueprint for registration on the first request.
+    
+    Args:
+        app: Flask application instance
+        import_spec: Blueprint location as "package.module:attribute"
+        url_prefix: URL prefix to mount the blueprint under
+    """
+    _get_loader(app).pending.append((import_spec, url_prefix))
+
+
+def init_with_blueprints(app, callback):
+    """
+    Run an initializer once the lazily registered blueprints are loaded.
+    
+    Args:
+        app: Flask application instance
+        callback: Callable taking the app, e.g. an extension's init_app
+    """
+    _get_loader(app).callbacks.append(callback)
+
+
+def _schema_init_key(app) -> str:
+    """Redis key identifying this database URI and model schema."""
+    signature = '|'.join(
+        f"{table.name}:{','.join(column.name for column in table.columns)}"
+        for table in sorted(db.metadata.tables.values(), key=lambda table: table.name)
+    )
+    digest = hashlib.blake2b(
+        f"{app.config['SQLALCHEMY_DATABASE_URI']}\n{signature}".encode(),
+        digest_size=16
+    ).hexdigest()
+    return f"radar:schema:{digest}"
+
+
+def claim_schema_init(app) -> bool:
+    """
+    Decide whether this process should run db.create_all().
+    
+    When several workers boot together, only the first one to set a Redis
+    key for this database and schema gets True; the rest skip the per-table
+    existence checks. The key expires after SCHEMA_INIT_GUARD_TTL seconds
+    so a recreated database is initialized on the next boot after that.
+    Without Redis (or under TESTING) every process runs create_all().
+    
+    Args:
+        app: Flask application instance (models imported)
+        
+    Returns:
+        True if create_all() should run
+    """
+    if app.testing:
+        return True
+    
+    try:
+        return bool(redis_client.set(
+            _schema_init_key(app), 1, nx=True, ex=app.config.get('SCHEMA_INIT_GUARD_TTL', 300)
+        ))
+    except redis.RedisError as e:
+        logging.getLogger(__name__).warning(f"Schema init guard unavailable: {str(e)}")
+        return True
+
+
+def release_schema_init(app):
+    """Drop the claim after a failed create_all() so the next boot retries."""
+    if app.testing:
+        return
+    try:
+        redis_client.delete(_schema_init_key(app))
+    except redis.RedisError:
+        pass
+
+
+def load_blueprints(app):
+    """
+    Register any blueprints still queued by register_lazy.
+    
+    Args:
+        app: Flask application instance
+    """
+    _get_loader(app).load()
+
+
+def create_app(config_class=Config, lazy_blueprints=False):
     """
     Application factory pattern for Flask.
     
     Args:
         config_class: Configuration class to use (default: Config)
+        lazy_blueprints: Defer blueprint imports to the first request. Only
+            meant for WSGI servers; CLI, Celery and tests get a complete
+            URL map straight away.
         
     Returns:
         Configured Flask application instance
     """
     app = Flask(__name__)
     app.config.from_object(config_class)
+    app.json = ORJSONProvider(app)
     
     # Initialize logging first
     setup_logging(app)
     logger = logging.getLogger(__name__)
     logger.info("Initializing Radar application")
     
-    # Initialize security manager
-    from app.utils.security import init_security_manager
-    init_security_manager(app.config['ENCRYPTION_KEY'])
-    
     # Initialize extensions
     db.init_app(app)
     redis_client.init_app(app)
@@ -60,7 +243,10 @@ def create_app(config_class=Config):
         enable_utc=app.config['CELERY_ENABLE_UTC'],
         task_track_started=app.config['CELERY_TASK_TRACK_STARTED'],
         task_time_limit=app.config['CELERY_TASK_TIME_LIMIT'],
-        task_soft_time_limit=app.config['CELERY_TASK_SOFT_TIME_LIMIT']
+        task_soft_time_limit=app.config['CELERY_TASK_SOFT_TIME_LIMIT'],
+        broker_pool_limit=app.config['CELERY_BROKER_POOL_LIMIT'],
+        broker_transport_options=app.config['CELERY_BROKER_TRANSPORT_OPTIONS'],
+        worker_prefetch_multiplier=app.config['CELERY_WORKER_PREFETCH_MULTIPLIER']
     )
     
     class ContextTask(celery.Task):
@@ -78,70 +264,45 @@ def create_app(config_class=Config):
     def load_user(user_id):
         """Load user for Flask-Login."""
         from app.auth.models import User
-        return User.query.get(user_id)
-    
-    csrf.init_app(app)
+        return db.session.get(User, user_id)
     
-    # Initialize rate limiter with Redis storage
-    limiter.storage_uri = app.config['RATELIMIT_STORAGE_URL']
+    # Initialize rate limiter (storage from RATELIMIT_STORAGE_URI)
     limiter.init_app(app)
     
-    # CORS configuration (restrictive for security)
-    CORS(
+    # CORS headers (restrictive for security)
+    init_cors(
         app,
         origins=app.config.get('ALLOWED_ORIGINS', []),
-        supports_credentials=True,
         methods=['GET', 'POST', 'PUT', 'DELETE', 'OPTIONS'],
-        allow_headers=['Content-Type', 'Authorization', 'X-CSRFToken']
+        allow_headers=['Content-Type', 'Authorization', 'X-CSRFToken'],
+        supports_credentials=True
     )
     
-    # Register blueprints (lazy import to avoid circular dependencies)
-    # Blueprints will be imported when routes are registered
-    # Register blueprints (lazy import to avoid circular dependencies)
-    try:
-        from app.auth.routes import auth_bp
-        app.register_blueprint(auth_bp, url_prefix='/api/auth')
-    except ImportError as e:
-        logger.warning(f"Auth blueprint not available: {str(e)}")
-    
-    try:
-        from app.companies.routes import companies_bp
-        app.register_blueprint(companies_bp, url_prefix='/api/companies')
-    except ImportError as e:
-        logger.warning(f"Companies blueprint not available: {str(e)}")
-    
-    try:
-        from app.reports.routes import reports_bp
-        app.register_blueprint(reports_bp, url_prefix='/api/reports')
-    except ImportError as e:
-        logger.warning(f"Reports blueprint not available: {str(e)}")
+    # Queue blueprints; under a WSGI server modules are imported on the first request
+    for import_spec, url_prefix in BLUEPRINTS:
+        register_lazy(app, import_spec, url_prefix)
     
-    try:
-        from app.dashboard.routes import dashboard_bp
-        app.register_blueprint(dashboard_bp, url_prefix='/api/dashboard')
-    except ImportError as e:
-        logger.warning(f"Dashboard blueprint not available: {str(e)}")
+    # CSRF protection only guards blueprint views, so it is wired up with them
+    init_with_blueprints(app, csrf.init_app)
     
-    try:
-        from app.scheduling.routes import scheduling_bp
-        app.register_blueprint(scheduling_bp, url_prefix='/api/scheduling')
-    except ImportError as e:
-        logger.warning(f"Scheduling blueprint not available: {str(e)}")
+    if not lazy_blueprints:
+        load_blueprints(app)
     
     # Register error handlers
     from app.utils.error_handlers import register_error_handlers
     register_error_handlers(app)
     
-    # Import models for database initialization
-    from app.auth.models import User, PasswordResetToken
-    from app.companies.models import Company, Competitor, TrackingConfig
-    from app.intelligence.models import IntelligenceData, Startup
-    from app.reports.models import Report
-    
-    # Create database tables
-    with app.app_context():
-        db.create_all()
-        logger.info("Database tables initialized")
+    # Create missing database tables (first booting worker only, see claim_schema_init)
+    if app.config.get('AUTO_CREATE_TABLES'):
+        with app.app_context():
+            import_models()
+            if claim_schema_init(app):
+                try:
+                    db.create_all()
+                except Exception:
+                    release_schema_init(app)
+                    raise
+                logger.info("Database tables initialized")
     
     logger.info("Radar application initialized successfully")
     
@@ -4,16 +4,86 @@ Authentication and authorization decorators for Radar application.
 Provides role-based access control decorators for route protection.
 """
 
-from functools import wraps
-from flask import jsonify, request
+from functools import update_wrapper, wraps
+from flask import g, jsonify, request
 from flask_jwt_extended import verify_jwt_in_request, get_jwt
 from flask_login import current_user
 from app.auth.models import UserRole
-from typing import List, Callable, Any
+from typing import Any, Callable, FrozenSet, Optional, Tuple
 import logging
 
 
 logger = logging.getLogger(__name__)
+_warn = logger.warning
+
+
+def _get_claims_cached() -> dict:
+    """
+    Verify the request's JWT once and return its claims.
+    
+    The decoded claims are kept on flask.g, so stacked guards on the same
+    request do not verify the token again.
+    
+    Returns:
+        Decoded JWT claims
+    """
+    claims = getattr(g, '_jwt_claims', None)
+    if claims is None:
+        verify_jwt_in_request()
+        claims = get_jwt()
+        g._jwt_claims = claims
+    return claims
+
+
+class _RoleGuard:
+    """
+    Callable wrapper that enforces JWT authentication and, optionally, a role.
+    
+    A single instance replaces the per-view closure the decorators used to
+    build, so every protected request goes through one shared __call__.
+    """
+    
+    # __dict__ stays available for the attributes set by functools.update_wrapper
+    __slots__ = ('f', 'allowed', 'denied_message', '__dict__')
+    
+    def __init__(self, f: Callable, allowed: Optional[FrozenSet[str]] = None,
+                 denied_message: Optional[str] = None):
+        self.f = f
+        self.allowed = allowed
+        self.denied_message = denied_message
+    
+    def __call__(self, *args: Any, **kwargs: Any) -> Any:
+        # Verify JWT token is present
+        try:
+            user_role = _get_claims_cached().get('role')
+        except Exception as e:
+            _warn('JWT verification failed: %s', e)
+            return jsonify({
+                'error': 'Unauthorized',
+                'message': 'Authentication required'
+            }), 401
+        
+        # Check if user has required role
+        if self.allowed is not None and user_role not in self.allowed:
+            _warn('Access denied for role %s to %s', user_role, request.endpoint)
+            return jsonify({
+                'error': 'Forbidden',
+                'message': self.denied_message
+            }), 403
+        
+        return self.f(*args, **kwargs)
+
+
+def _role_guard(roles: Tuple[UserRole, ...], message_prefix: str) -> Callable:
+    """Build a decorator that wraps views in a _RoleGuard for the given roles."""
+    # Resolved once at decoration time instead of on every request
+    allowed = frozenset(roles)
+    denied_message = f'Insufficient permissions. {message_prefix}: {[role.value for role in roles]}'
+    
+    def decorator(f: Callable) -> Callable:
+        return update_wrapper(_RoleGuard(f, allowed, denied_message), f)
+    
+    return decorator
 
 
 def requires_role(*roles: UserRole):
@@ -32,34 +102,7 @@ def requires_role(*roles: UserRole):
     Returns:
         Decorator function
     """
-    def decorator(f: Callable) -> Callable:
-        @wraps(f)
-        def decorated_function(*args: Any, **kwargs: Any) -> Any:
-            # Verify JWT token is present
-            try:
-                verify_jwt_in_request()
-                claims = get_jwt()
-                user_role = claims.get('role')
-            except Exception as e:
-                logger.warning(f"JWT verification failed: {str(e)}")
-                return jsonify({
-                    'error': 'Unauthorized',
-                    'message': 'Authentication required'
-                }), 401
-            
-            # Check if user has required role
-            if user_role not in [role.value for role in roles]:
-                logger.warning(f"Access denied for role {user_role} to {request.endpoint}")
-                return jsonify({
-                    'error': 'Forbidden',
-                    'message': f'Insufficient permissions. Required roles: {[r.value for r in roles]}'
-                }), 403
-            
-            return f(*args, **kwargs)
-        
-        return decorated_function
-    
-    return decorator
+    return _role_guard(roles, 'Required roles')
 
 
 def requires_any_role(*roles: UserRole):
@@ -78,33 +121,7 @@ def requires_any_role(*roles: UserRole):
     Returns:
         Decorator function
     """
-    def decorator(f: Callable) -> Callable:
-        @wraps(f)
-        def decorated_function(*args: Any, **kwargs: Any) -> Any:
-            try:
-                verify_jwt_in_request()
-                claims = get_jwt()
-                user_role = claims.get('role')
-            except Exception as e:
-                logger.warning(f"JWT verification failed: {str(e)}")
-                return jsonify({
-                    'error': 'Unauthorized',
-                    'message': 'Authentication required'
-                }), 401
-            
-            # Check if user has any of the required roles
-            if user_role not in [role.value for role in roles]:
-                logger.warning(f"Access denied for role {user_role} to {request.endpoint}")
-                return jsonify({
-                    'error': 'Forbidden',
-                    'message': f'Insufficient permissions. Requires one of: {[r.value for r in roles]}'
-                }), 403
-            
-            return f(*args, **kwargs)
-        
-        return decorated_function
-    
-    return decorator
+    return _role_guard(roles, 'Requires one of')
 
 
 def requires_admin(f: Callable) -> Callable:
@@ -142,20 +159,7 @@ def requires_authentication(f: Callable) -> Callable:
     Returns:
         Decorated function
     """
-    @wraps(f)
-    def decorated_function(*args: Any, **kwargs: Any) -> Any:
-        try:
-            verify_jwt_in_request()
-        except Exception as e:
-            logger.warning(f"JWT verification failed: {str(e)}")
-            return jsonify({
-                'error': 'Unauthorized',
-                'message': 'Authentication required'
-            }), 401
-        
-        return f(*args, **kwargs)
-    
-    return decorated_function
+    return update_wrapper(_RoleGuard(f), f)
 
 
 def optional_authentication(f: Callable) -> Callable:
@@ -177,7 +181,7 @@ def optional_authentication(f: Callable) -> Callable:
     @wraps(f)
     def decorated_function(*args: Any, **kwargs: Any) -> Any:
         try:
-            verify_jwt_in_request()
+            _get_claims_cached()
         except Exception:
             # Authentication is optional, continue without it
             pass
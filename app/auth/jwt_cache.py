@@ -0,0 +1,59 @@
+"""
+JWT verification caching for Radar application.
+
+Provides a JWTManager that keeps recently verified token claims in a short
+in-process TTL cache, so repeated requests with the same token skip the
+signature check and claim validation.
+"""
+
+from flask_jwt_extended import JWTManager
+from cachetools import TLRUCache
+import hashlib
+import threading
+import time
+
+
+class CachingJWTManager(JWTManager):
+    """
+    JWTManager that caches decoded claims per raw token.
+
+    Entries live for JWT_DECODE_CACHE_TTL seconds, never past the token's
+    own expiry. Setting JWT_DECODE_CACHE_TTL to 0 disables the cache.
+    """
+
+    def __init__(self, app=None, **kwargs):
+        self._decode_cache = None
+        self._decode_cache_ttl = 0
+        self._decode_cache_lock = threading.Lock()
+        super().__init__(app, **kwargs)
+
+    def init_app(self, app):
+        """
+        Register the extension and size the claims cache from app config.
+
+        Args:
+            app: Flask application instance
+        """
+        super().init_app(app)
+        self._decode_cache_ttl = app.config.get('JWT_DECODE_CACHE_TTL', 5)
+        self._decode_cache = TLRUCache(
+            maxsize=app.config.get('JWT_DECODE_CACHE_SIZE', 10000),
+            ttu=lambda key, claims, now: min(now + self._decode_cache_ttl, claims.get('exp', now)),
+            timer=time.time
+        )
+
+    def _decode_jwt_from_config(self, encoded_token: str, csrf_value=None, allow_expired: bool = False) -> dict:
+        if allow_expired or not self._decode_cache_ttl:
+            return super()._decode_jwt_from_config(encoded_token, csrf_value, allow_expired)
+
+        # The CSRF value is part of the key because it is checked during decode
+        cache_key = (hashlib.blake2b(encoded_token.encode(), digest_size=16).digest(), csrf_value)
+        with self._decode_cache_lock:
+            claims = self._decode_cache.get(cache_key)
+        if claims is None:
+            claims = super()._decode_jwt_from_config(encoded_token, csrf_value, allow_expired)
+            with self._decode_cache_lock:
+                self._decode_cache[cache_key] = claims
+
+        # Callers get their own copy so the cached claims cannot be modified
+        return dict(claims)
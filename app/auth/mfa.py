@@ -8,19 +8,105 @@ and backup codes for account recovery.
 from app.extensions import db
 from app.auth.models import User
 from app.utils.security import get_security_manager
-import pyotp
-import qrcode
-import io
-import base64
+from sqlalchemy import update
+from sqlalchemy.dialects.postgresql import JSONB
 import secrets
-import hashlib
-from typing import Tuple, Optional, List, Dict, Any
+import json
+from functools import lru_cache
+from typing import Tuple, Optional, List, Dict, Any, Set
 import logging
 
 
 logger = logging.getLogger(__name__)
 
 
+def _hash_backup_codes(codes: List[str]) -> List[str]:
+    """
+    Hash backup codes for storage.
+    
+    Args:
+        codes: Plaintext backup codes
+        
+    Returns:
+        List of SHA-256 hex digests
+    """
+    import hashlib
+    
+    return [hashlib.sha256(code.encode('ascii')).hexdigest() for code in codes]
+
+
+def _load_backup_codes(stored: Any) -> Set[str]:
+    """
+    Parse stored backup code hashes into a set.
+    
+    Args:
+        stored: List of hashes (or a legacy JSON / comma-separated string)
+        
+    Returns:
+        Set of hashed backup codes
+    """
+    if not stored:
+        return set()
+    if isinstance(stored, str):
+        return set(json.loads(stored)) if stored.startswith('[') else set(stored.split(','))
+    return set(stored)
+
+
+def _consume_backup_code(user: User, hashed_code: str) -> bool:
+    """
+    Remove a hashed backup code from the user's remaining codes.
+    
+    On PostgreSQL the code is checked and removed by a single UPDATE, so two
+    concurrent requests cannot both spend the same code. Other databases
+    fall back to a read-modify-write on the loaded row.
+    
+    Args:
+        user: User object
+        hashed_code: SHA-256 hex digest of the submitted code
+        
+    Returns:
+        True if the code was present and has been removed, False otherwise
+    """
+    if db.engine.dialect.name == 'postgresql':
+        code_param = db.literal(hashed_code, db.String)
+        result = db.session.execute(
+            update(User)
+            .where(User.id == user.id, User.backup_codes.op('?')(code_param))
+            .values(backup_codes=User.backup_codes.op('-', return_type=JSONB)(code_param))
+            .returning(User.id)
+            .execution_options(synchronize_session=False)
+        )
+        consumed = result.first() is not None
+        db.session.expire(user, ['backup_codes'])
+        return consumed
+    
+    backup_codes = _load_backup_codes(user.backup_codes)
+    if hashed_code not in backup_codes:
+        return False
+    backup_codes.discard(hashed_code)
+    user.backup_codes = sorted(backup_codes) or None
+    return True
+
+
+@lru_cache(maxsize=4096)
+def _totp_for(encrypted_secret: str):
+    """
+    Build the TOTP verifier for an encrypted MFA secret.
+    
+    Cached per ciphertext so repeated logins skip the decrypt and pyotp
+    setup; a new secret always produces a new ciphertext.
+    
+    Args:
+        encrypted_secret: Encrypted TOTP secret as stored on the user
+        
+    Returns:
+        pyotp.TOTP instance
+    """
+    import pyotp
+    
+    return pyotp.TOTP(get_security_manager().decrypt(encrypted_secret))
+
+
 class MFAService:
     """Service for MFA operations."""
     
@@ -32,6 +118,9 @@ class MFAService:
         Returns:
             Base32-encoded TOTP secret
         """
+        # MFA dependencies are imported on use to keep them off the boot path
+        import pyotp
+        
         return pyotp.random_base32()
     
     @staticmethod
@@ -45,8 +134,14 @@ class MFAService:
             issuer: Issuer name (default: 'Radar')
             
         Returns:
-            Base64-encoded PNG image data
+            SVG image as a data URI
         """
+        from urllib.parse import quote
+        
+        import pyotp
+        import qrcode
+        from qrcode.image.svg import SvgPathFillImage
+        
         # Create TOTP URI
         totp_uri = pyotp.totp.TOTP(secret).provisioning_uri(
             name=email,
@@ -63,15 +158,10 @@ class MFAService:
         qr.add_data(totp_uri)
         qr.make(fit=True)
         
-        # Create image
-        img = qr.make_image(fill_color="black", back_color="white")
-        
-        # Convert to base64
-        buffer = io.BytesIO()
-        img.save(buffer, format='PNG')
-        img_data = base64.b64encode(buffer.getvalue()).decode()
+        # Render as an SVG path on a white background (no Pillow rasterization)
+        img = qr.make_image(image_factory=SvgPathFillImage)
         
-        return f"data:image/png;base64,{img_data}"
+        return f"data:image/svg+xml;charset=utf-8,{quote(img.to_string(encoding='unicode'))}"
     
     @staticmethod
     def enable_mfa(user: User, secret: str, verification_code: str) -> Tuple[bool, str]:
@@ -86,6 +176,8 @@ class MFAService:
         Returns:
             Tuple of (success, message)
         """
+        import pyotp
+        
         try:
             # Verify code
             totp = pyotp.TOTP(secret)
@@ -98,12 +190,11 @@ class MFAService:
             
             # Generate backup codes
             backup_codes = MFAService.generate_backup_codes()
-            hashed_codes = [hashlib.sha256(code.encode()).hexdigest() for code in backup_codes]
             
             # Store encrypted secret and backup codes
             user.mfa_secret = encrypted_secret
             user.mfa_enabled = True
-            user.backup_codes = ','.join(hashed_codes)  # Store hashed codes
+            user.backup_codes = _hash_backup_codes(backup_codes)  # Store hashed codes
             
             db.session.commit()
             
@@ -128,28 +219,22 @@ class MFAService:
         Returns:
             True if code is valid, False otherwise
         """
+        import hashlib
+        
         try:
             # Check if MFA is enabled
             if not user.mfa_enabled or not user.mfa_secret:
                 return False
             
-            # Decrypt secret
-            security_manager = get_security_manager()
-            secret = security_manager.decrypt(user.mfa_secret)
-            
             # Try TOTP code first
-            totp = pyotp.TOTP(secret)
+            totp = _totp_for(user.mfa_secret)
             if totp.verify(code, valid_window=1):
                 return True
             
             # Try backup codes
             if user.backup_codes:
                 hashed_input = hashlib.sha256(code.encode()).hexdigest()
-                backup_codes = user.backup_codes.split(',')
-                if hashed_input in backup_codes:
-                    # Remove used backup code
-                    backup_codes.remove(hashed_input)
-                    user.backup_codes = ','.join(backup_codes) if backup_codes else None
+                if _consume_backup_code(user, hashed_input):
                     db.session.commit()
                     logger.info(f"Backup code used for user: {user.email}")
                     return True
@@ -157,6 +242,7 @@ class MFAService:
             return False
             
         except Exception as e:
+            db.session.rollback()
             logger.error(f"Error verifying MFA code: {str(e)}", exc_info=True)
             return False
     
@@ -175,8 +261,10 @@ class MFAService:
             user.mfa_enabled = False
             user.mfa_secret = None
             user.backup_codes = None
+            user.bump_token_version()
             
             db.session.commit()
+            _totp_for.cache_clear()
             
             logger.info(f"MFA disabled for user: {user.email}")
             return True, "MFA disabled successfully"
@@ -197,11 +285,9 @@ class MFAService:
         Returns:
             List of backup codes (8-character alphanumeric)
         """
-        codes = []
-        for _ in range(count):
-            code = secrets.token_hex(4).upper()  # 8-character code
-            codes.append(code)
-        return codes
+        # One entropy read for all codes, sliced into 4-byte (8 hex char) codes
+        raw = secrets.token_bytes(4 * count).hex().upper()
+        return [raw[i:i + 8] for i in range(0, 8 * count, 8)]
     
     @staticmethod
     def regenerate_backup_codes(user: User) -> Tuple[bool, List[str], str]:
@@ -220,10 +306,9 @@ class MFAService:
             
             # Generate new backup codes
             backup_codes = MFAService.generate_backup_codes()
-            hashed_codes = [hashlib.sha256(code.encode()).hexdigest() for code in backup_codes]
             
             # Store hashed codes
-            user.backup_codes = ','.join(hashed_codes)
+            user.backup_codes = _hash_backup_codes(backup_codes)
             db.session.commit()
             
             logger.info(f"Backup codes regenerated for user: {user.email}")
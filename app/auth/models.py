@@ -6,16 +6,27 @@ and OAuth support.
 """
 
 from app.extensions import db
+from app.auth.passwords import hash_password, verify_password, needs_rehash
+from app.utils.identifiers import generate_uuid7
 from flask_login import UserMixin
-from werkzeug.security import generate_password_hash, check_password_hash
+from sqlalchemy import and_
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.ext.hybrid import hybrid_property
 from datetime import datetime, timedelta
-import uuid
 import enum
+import operator
 from typing import Optional
 
 
-class UserRole(enum.Enum):
-    """User role enumeration."""
+# Attributes serialized by User.to_dict, fetched in a single call
+_USER_FIELDS = operator.attrgetter(
+    'id', 'email', 'first_name', 'last_name', 'role', 'is_active', 'is_verified',
+    'mfa_enabled', 'oauth_provider', 'created_at', 'last_login'
+)
+
+
+class UserRole(str, enum.Enum):
+    """User role enumeration (members compare equal to their string values)."""
     CEO = 'CEO'
     CFO = 'CFO'
     ADMIN = 'Admin'
@@ -26,7 +37,7 @@ class User(db.Model, UserMixin):
     User model with authentication and authorization.
     
     Supports:
-    - Password-based authentication (bcrypt)
+    - Password-based authentication (configurable hash, bcrypt by default)
     - OAuth (Google, Microsoft)
     - Multi-factor authentication (TOTP)
     - Role-based access control
@@ -34,8 +45,9 @@ class User(db.Model, UserMixin):
     
     __tablename__ = 'users'
     
-    id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    id = db.Column(db.String(36), primary_key=True, default=generate_uuid7)
     email = db.Column(db.String(255), unique=True, nullable=False, index=True)
+    email_normalized = db.Column(db.String(255), db.Computed('lower(trim(email))', persisted=True))
     password_hash = db.Column(db.String(255), nullable=True)  # Nullable for OAuth-only users
     
     # Profile
@@ -46,7 +58,7 @@ class User(db.Model, UserMixin):
     # MFA
     mfa_secret = db.Column(db.Text, nullable=True)  # Encrypted TOTP secret
     mfa_enabled = db.Column(db.Boolean, default=False, nullable=False)
-    backup_codes = db.Column(db.Text, nullable=True)  # JSON array of hashed backup codes
+    backup_codes = db.Column(db.JSON().with_variant(JSONB, 'postgresql'), nullable=True)  # Hashed backup codes
     
     # OAuth
     oauth_provider = db.Column(db.String(50), nullable=True)  # 'google', 'microsoft', None
@@ -64,6 +76,7 @@ class User(db.Model, UserMixin):
     locked_until = db.Column(db.DateTime, nullable=True)
     last_login = db.Column(db.DateTime, nullable=True)
     password_changed_at = db.Column(db.DateTime, nullable=True)
+    token_version = db.Column(db.Integer, default=0, nullable=False)  # Bumped on password change / MFA disable
     
     # Timestamps
     created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
@@ -73,27 +86,45 @@ class User(db.Model, UserMixin):
     companies = db.relationship('Company', backref='user', lazy='dynamic', cascade='all, delete-orphan')
     reports = db.relationship('Report', backref='user', lazy='dynamic', cascade='all, delete-orphan')
     
+    # Indexes
+    __table_args__ = (
+        db.Index('idx_users_email_normalized', 'email_normalized', unique=True),
+        # Partial index: only locked accounts are indexed (PostgreSQL)
+        db.Index('idx_users_locked_until', 'locked_until',
+                 postgresql_where=db.text('locked_until IS NOT NULL')),
+    )
+    
     def __init__(self, **kwargs):
         """Initialize User with password hashing if provided."""
         if 'password' in kwargs:
             password = kwargs.pop('password')
-            kwargs['password_hash'] = generate_password_hash(password)
+            kwargs['password_hash'] = hash_password(password)
         super(User, self).__init__(**kwargs)
     
     def set_password(self, password: str):
         """
-        Set password with bcrypt hashing.
+        Set password using the configured hash method.
         
         Args:
             password: Plaintext password
         """
-        self.password_hash = generate_password_hash(password)
+        self.password_hash = hash_password(password)
         self.password_changed_at = datetime.utcnow()
+        self.bump_token_version()
+    
+    def bump_token_version(self):
+        """Invalidate access tokens cached for this user's refreshes."""
+        self.token_version = (self.token_version or 0) + 1
     
     def check_password(self, password: str) -> bool:
         """
         Verify password against hash.
         
+        A matching password stored with an outdated hasher or cost is
+        re-hashed in place; the caller's commit persists it. Passwords the
+        configured hasher cannot take (over 72 bytes for bcrypt) keep
+        their existing hash.
+        
         Args:
             password: Plaintext password to verify
             
@@ -102,12 +133,22 @@ class User(db.Model, UserMixin):
         """
         if not self.password_hash:
             return False
-        return check_password_hash(self.password_hash, password)
+        if not verify_password(self.password_hash, password):
+            return False
+        if needs_rehash(self.password_hash):
+            try:
+                self.password_hash = hash_password(password)
+            except ValueError:
+                pass
+        return True
     
+    @hybrid_property
     def is_locked(self) -> bool:
         """
         Check if account is locked due to failed login attempts.
         
+        Usable in queries as well, e.g. User.query.filter(User.is_locked).
+        
         Returns:
             True if account is locked, False otherwise
         """
@@ -115,35 +156,45 @@ class User(db.Model, UserMixin):
             return False
         return datetime.utcnow() < self.locked_until
     
+    @is_locked.expression
+    def is_locked(cls):
+        """SQL form of is_locked (locked_until is stored as naive UTC)."""
+        return and_(cls.locked_until.isnot(None), cls.locked_until > datetime.utcnow())
+    
     def lock_account(self, duration_minutes: int = 15):
         """
         Lock account after failed login attempts.
         
+        The caller is responsible for committing the session.
+        
         Args:
             duration_minutes: Lock duration in minutes
         """
         self.locked_until = datetime.utcnow() + timedelta(minutes=duration_minutes)
         self.failed_login_attempts = 0  # Reset counter after locking
-        db.session.commit()
     
     def record_failed_login(self, max_attempts: int = 5):
         """
         Record failed login attempt and lock if threshold reached.
         
+        The caller is responsible for committing the session.
+        
         Args:
             max_attempts: Maximum failed attempts before locking
         """
         self.failed_login_attempts += 1
         if self.failed_login_attempts >= max_attempts:
             self.lock_account()
-        db.session.commit()
     
     def record_successful_login(self):
-        """Record successful login and reset failed attempts."""
+        """
+        Record successful login and reset failed attempts.
+        
+        The caller is responsible for committing the session.
+        """
         self.failed_login_attempts = 0
         self.last_login = datetime.utcnow()
         self.locked_until = None
-        db.session.commit()
     
     def has_role(self, role: UserRole) -> bool:
         """
@@ -171,23 +222,26 @@ class User(db.Model, UserMixin):
         Returns:
             User dictionary
         """
+        (user_id, email, first_name, last_name, role, is_active, is_verified,
+         mfa_enabled, oauth_provider, created_at, last_login) = _USER_FIELDS(self)
+        
         data = {
-            'id': self.id,
-            'email': self.email,
-            'first_name': self.first_name,
-            'last_name': self.last_name,
-            'role': self.role.value if self.role else None,
-            'is_active': self.is_active,
-            'is_verified': self.is_verified,
-            'mfa_enabled': self.mfa_enabled,
-            'oauth_provider': self.oauth_provider,
-            'created_at': self.created_at.isoformat() if self.created_at else None,
-            'last_login': self.last_login.isoformat() if self.last_login else None
+            'id': user_id,
+            'email': email,
+            'first_name': first_name,
+            'last_name': last_name,
+            'role': role.value if role else None,
+            'is_active': is_active,
+            'is_verified': is_verified,
+            'mfa_enabled': mfa_enabled,
+            'oauth_provider': oauth_provider,
+            'created_at': created_at,
+            'last_login': last_login
         }
         
         if include_sensitive:
             data['failed_login_attempts'] = self.failed_login_attempts
-            data['locked_until'] = self.locked_until.isoformat() if self.locked_until else None
+            data['locked_until'] = self.locked_until
         
         return data
     
@@ -204,7 +258,7 @@ class PasswordResetToken(db.Model):
     
     __tablename__ = 'password_reset_tokens'
     
-    id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    id = db.Column(db.String(36), primary_key=True, default=generate_uuid7)
     user_id = db.Column(db.String(36), db.ForeignKey('users.id'), nullable=False, index=True)
     token = db.Column(db.String(100), unique=True, nullable=False, index=True)
     expires_at = db.Column(db.DateTime, nullable=False, index=True)
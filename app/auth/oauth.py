@@ -7,10 +7,20 @@ Implements Google and Microsoft Azure AD OAuth 2.0 flows.
 from flask import Blueprint, request, jsonify, redirect, url_for, session, current_app
 from app.extensions import db
 from app.auth.models import User, UserRole
-from app.auth.services import AuthService
+from app.auth.services import AuthService, upsert_insert
 from app.utils.security import get_security_manager
-import requests
-from typing import Tuple, Optional, Dict, Any
+from app.utils.http import create_session
+from sqlalchemy import case, false
+from datetime import datetime
+from functools import lru_cache
+from cachetools import TLRUCache
+from jwt import PyJWKClient
+import jwt
+import hashlib
+import orjson
+import threading
+from urllib.parse import urlencode
+from typing import Tuple, Optional, Dict, Any, Callable
 import logging
 
 
@@ -25,6 +35,140 @@ MICROSOFT_AUTHORIZATION_URL = 'https://login.microsoftonline.com/common/oauth2/v
 MICROSOFT_TOKEN_URL = 'https://login.microsoftonline.com/common/oauth2/v2.0/token'
 MICROSOFT_USERINFO_URL = 'https://graph.microsoft.com/v1.0/me'
 
+# ID token signing keys (JWKS) and issuers
+GOOGLE_JWKS_URL = 'https://www.googleapis.com/oauth2/v3/certs'
+GOOGLE_ISSUERS = frozenset(['https://accounts.google.com', 'accounts.google.com'])
+MICROSOFT_JWKS_URL = 'https://login.microsoftonline.com/common/discovery/v2.0/keys'
+MICROSOFT_ISSUER_TEMPLATE = 'https://login.microsoftonline.com/{tid}/v2.0'
+
+# Provider-constant authorization parameters, encoded once
+_GOOGLE_STATIC_PARAMS = urlencode({
+    'response_type': 'code',
+    'scope': 'openid email profile',
+    'access_type': 'offline',
+    'prompt': 'consent'
+})
+_MICROSOFT_STATIC_PARAMS = urlencode({
+    'response_type': 'code',
+    'scope': 'openid email profile',
+    'response_mode': 'query'
+})
+
+# Connect/read timeouts for provider calls
+OAUTH_TIMEOUT = (3.05, 10)
+
+# Shared keep-alive pool for the provider hosts. Only the userinfo GETs are
+# retried; authorization codes are single-use, so token POSTs are not.
+_SESSION = create_session(pool_connections=32, pool_maxsize=64, retries=3)
+
+# Signing keys are fetched on first use and cached by PyJWKClient
+_GOOGLE_JWKS = PyJWKClient(GOOGLE_JWKS_URL, cache_keys=True, lifespan=3600, timeout=10)
+_MICROSOFT_JWKS = PyJWKClient(MICROSOFT_JWKS_URL, cache_keys=True, lifespan=3600, timeout=10)
+
+# Userinfo responses keyed by (provider, sha256(access_token)); each entry
+# stores its own TTL, capped by the access token's lifetime
+USERINFO_CACHE_TTL = 300
+_USERINFO_CACHE = TLRUCache(maxsize=4096, ttu=lambda key, value, now: now + value[0])
+_USERINFO_LOCK = threading.Lock()
+
+# Provider error bodies are truncated to this many bytes in messages
+ERROR_BODY_LIMIT = 512
+
+
+@lru_cache(maxsize=16)
+def _authorization_url(base_url: str, static_params: str, client_id: Optional[str], redirect_uri: str) -> str:
+    """Build (once per client/redirect pair) a provider authorization URL."""
+    params = urlencode({'client_id': client_id, 'redirect_uri': redirect_uri})
+    return f"{base_url}?{static_params}&{params}"
+
+
+def _error_body(response) -> str:
+    """Decode the start of a failed provider response for error messages."""
+    return response.content[:ERROR_BODY_LIMIT].decode('utf-8', 'replace')
+
+
+def _google_issuer(claims: Dict[str, Any]) -> bool:
+    return claims.get('iss') in GOOGLE_ISSUERS
+
+
+def _microsoft_issuer(claims: Dict[str, Any]) -> bool:
+    # Multi-tenant tokens are issued per tenant
+    return claims.get('iss') == MICROSOFT_ISSUER_TEMPLATE.format(tid=claims.get('tid'))
+
+
+def _verify_id_token(
+    id_token: Optional[str],
+    jwks_client: PyJWKClient,
+    client_id: str,
+    issuer_ok: Callable[[Dict[str, Any]], bool]
+) -> Optional[Dict[str, Any]]:
+    """
+    Verify an OpenID Connect ID token's signature, expiry, audience and issuer.
+    
+    Args:
+        id_token: Encoded ID token from the token response (may be None)
+        jwks_client: JWKS client for the provider's signing keys
+        client_id: Expected audience
+        issuer_ok: Check that the decoded claims come from the provider
+        
+    Returns:
+        Decoded claims, or None if the token is missing or fails verification
+    """
+    if not id_token:
+        return None
+    try:
+        signing_key = jwks_client.get_signing_key_from_jwt(id_token)
+        claims = jwt.decode(
+            id_token, signing_key.key, algorithms=['RS256'], audience=client_id,
+            options={'require': ['exp', 'iss', 'aud']}
+        )
+    except jwt.PyJWTError as e:
+        logger.warning(f"ID token verification failed, falling back to userinfo: {str(e)}")
+        return None
+    if not issuer_ok(claims):
+        logger.warning(f"ID token from unexpected issuer {claims.get('iss')!r}, falling back to userinfo")
+        return None
+    return claims
+
+
+def _fetch_userinfo(
+    provider: str,
+    url: str,
+    access_token: str,
+    expires_in: int
+) -> Tuple[Optional[Dict[str, Any]], bool, str]:
+    """
+    Fetch the provider's userinfo for an access token, using the local cache.
+    
+    Args:
+        provider: OAuth provider name ('google' or 'microsoft')
+        url: Provider userinfo endpoint
+        access_token: OAuth access token
+        expires_in: Access token lifetime in seconds
+        
+    Returns:
+        Tuple of (user_info, success, message)
+    """
+    cache_key = (provider, hashlib.sha256(access_token.encode()).hexdigest())
+    with _USERINFO_LOCK:
+        cached = _USERINFO_CACHE.get(cache_key)
+    if cached is not None:
+        return cached[1], True, "OAuth authentication successful"
+    
+    headers = {'Authorization': f'Bearer {access_token}'}
+    user_response = _SESSION.get(url, headers=headers, timeout=OAUTH_TIMEOUT)
+    if user_response.status_code != 200:
+        return None, False, f"User info fetch failed: {_error_body(user_response)}"
+    
+    user_info = orjson.loads(user_response.content)
+    
+    ttl = min(USERINFO_CACHE_TTL, expires_in - 30)
+    if ttl > 0:
+        with _USERINFO_LOCK:
+            _USERINFO_CACHE[cache_key] = (ttl, user_info)
+    
+    return user_info, True, "OAuth authentication successful"
+
 
 class OAuthService:
     """Service for OAuth operations."""
@@ -40,17 +184,10 @@ class OAuthService:
         Returns:
             Authorization URL string
         """
-        params = {
-            'client_id': current_app.config.get('GOOGLE_CLIENT_ID'),
-            'redirect_uri': redirect_uri,
-            'response_type': 'code',
-            'scope': 'openid email profile',
-            'access_type': 'offline',
-            'prompt': 'consent'
-        }
-        
-        query_string = '&'.join([f'{k}={v}' for k, v in params.items()])
-        return f"{GOOGLE_AUTHORIZATION_URL}?{query_string}"
+        return _authorization_url(
+            GOOGLE_AUTHORIZATION_URL, _GOOGLE_STATIC_PARAMS,
+            current_app.config.get('GOOGLE_CLIENT_ID'), redirect_uri
+        )
     
     @staticmethod
     def get_microsoft_authorization_url(redirect_uri: str) -> str:
@@ -63,16 +200,10 @@ class OAuthService:
         Returns:
             Authorization URL string
         """
-        params = {
-            'client_id': current_app.config.get('MICROSOFT_CLIENT_ID'),
-            'redirect_uri': redirect_uri,
-            'response_type': 'code',
-            'scope': 'openid email profile',
-            'response_mode': 'query'
-        }
-        
-        query_string = '&'.join([f'{k}={v}' for k, v in params.items()])
-        return f"{MICROSOFT_AUTHORIZATION_URL}?{query_string}"
+        return _authorization_url(
+            MICROSOFT_AUTHORIZATION_URL, _MICROSOFT_STATIC_PARAMS,
+            current_app.config.get('MICROSOFT_CLIENT_ID'), redirect_uri
+        )
     
     @staticmethod
     def exchange_google_code(code: str, redirect_uri: str) -> Tuple[Optional[Dict[str, Any]], bool, str]:
@@ -96,25 +227,39 @@ class OAuthService:
                 'grant_type': 'authorization_code'
             }
             
-            response = requests.post(GOOGLE_TOKEN_URL, data=token_data)
+            response = _SESSION.post(GOOGLE_TOKEN_URL, data=token_data, timeout=OAUTH_TIMEOUT)
             if response.status_code != 200:
-                return None, False, f"Token exchange failed: {response.text}"
+                return None, False, f"Token exchange failed: {_error_body(response)}"
             
-            token_info = response.json()
+            token_info = orjson.loads(response.content)
             access_token = token_info.get('access_token')
             
             if not access_token:
                 return None, False, "No access token received"
             
-            # Get user info
-            headers = {'Authorization': f'Bearer {access_token}'}
-            user_response = requests.get(GOOGLE_USERINFO_URL, headers=headers)
-            if user_response.status_code != 200:
-                return None, False, f"User info fetch failed: {user_response.text}"
-            
-            user_info = user_response.json()
+            # The signed ID token already carries the profile claims
+            claims = _verify_id_token(
+                token_info.get('id_token'),
+                _GOOGLE_JWKS,
+                current_app.config.get('GOOGLE_CLIENT_ID'),
+                _google_issuer
+            )
+            if claims and claims.get('email') and claims.get('email_verified') is True:
+                return claims, True, "OAuth authentication successful"
             
-            return user_info, True, "OAuth authentication successful"
+            # Get user info
+            user_info, success, message = _fetch_userinfo(
+                'google',
+                GOOGLE_USERINFO_URL,
+                access_token,
+                int(token_info.get('expires_in', USERINFO_CACHE_TTL))
+            )
+            if not success:
+                return None, False, message
+            # The v2 userinfo endpoint reports verification as verified_email
+            if user_info.get('verified_email') is not True:
+                return None, False, "Google account email is not verified"
+            return dict(user_info, email_verified=True), True, message
             
         except Exception as e:
             logger.error(f"Error exchanging Google OAuth code: {str(e)}", exc_info=True)
@@ -143,25 +288,41 @@ class OAuthService:
                 'scope': 'openid email profile'
             }
             
-            response = requests.post(MICROSOFT_TOKEN_URL, data=token_data)
+            response = _SESSION.post(MICROSOFT_TOKEN_URL, data=token_data, timeout=OAUTH_TIMEOUT)
             if response.status_code != 200:
-                return None, False, f"Token exchange failed: {response.text}"
+                return None, False, f"Token exchange failed: {_error_body(response)}"
             
-            token_info = response.json()
+            token_info = orjson.loads(response.content)
             access_token = token_info.get('access_token')
             
             if not access_token:
                 return None, False, "No access token received"
             
-            # Get user info
-            headers = {'Authorization': f'Bearer {access_token}'}
-            user_response = requests.get(MICROSOFT_USERINFO_URL, headers=headers)
-            if user_response.status_code != 200:
-                return None, False, f"User info fetch failed: {user_response.text}"
-            
-            user_info = user_response.json()
+            # The signed ID token already carries the profile claims
+            claims = _verify_id_token(
+                token_info.get('id_token'),
+                _MICROSOFT_JWKS,
+                current_app.config.get('MICROSOFT_CLIENT_ID'),
+                _microsoft_issuer
+            )
+            if claims and claims.get('email'):
+                # Graph's 'id' is the object id; keep using it as the stored OAuth id
+                claims.setdefault('id', claims.get('oid'))
+                # Tenants can set any email; only trust it when the token says so
+                claims['email_verified'] = claims.get('email_verified') is True
+                return claims, True, "OAuth authentication successful"
             
-            return user_info, True, "OAuth authentication successful"
+            # Get user info
+            user_info, success, message = _fetch_userinfo(
+                'microsoft',
+                MICROSOFT_USERINFO_URL,
+                access_token,
+                int(token_info.get('expires_in', USERINFO_CACHE_TTL))
+            )
+            if not success:
+                return None, False, message
+            # Graph's mail/userPrincipalName are directory attributes, not verified addresses
+            return dict(user_info, email_verified=False), True, message
             
         except Exception as e:
             logger.error(f"Error exchanging Microsoft OAuth code: {str(e)}", exc_info=True)
@@ -174,11 +335,16 @@ class OAuthService:
         email: str,
         first_name: str,
         last_name: str,
-        access_token: str = None
+        access_token: str = None,
+        email_verified: bool = False
     ) -> Tuple[Optional[User], bool, str]:
         """
         Create or update user from OAuth provider.
         
+        An existing account with the same email is only linked (and signed
+        in) when the provider has verified the email; otherwise only the
+        account already tied to this provider identity is returned.
+        
         Args:
             provider: OAuth provider name ('google' or 'microsoft')
             oauth_id: OAuth provider user ID
@@ -186,6 +352,7 @@ class OAuthService:
             first_name: User first name
             last_name: User last name
             access_token: OAuth access token (optional, for storage)
+            email_verified: Whether the provider vouches for the email
             
         Returns:
             Tuple of (user, success, message)
@@ -193,44 +360,55 @@ class OAuthService:
         try:
             email = email.strip().lower()
             
-            # Check if user exists by email
-            user = User.query.filter_by(email=email).first()
-            
-            if user:
-                # Update existing user with OAuth info
-                if not user.oauth_provider:
-                    # Link OAuth to existing account
-                    user.oauth_provider = provider
-                    user.oauth_id = oauth_id
-                    if access_token:
-                        security_manager = get_security_manager()
-                        user.oauth_token = security_manager.encrypt(access_token)
-                    user.is_verified = True  # OAuth emails are pre-verified
-                    db.session.commit()
-                    logger.info(f"OAuth linked to existing account: {email}")
-                return user, True, "OAuth authentication successful"
-            
-            # Create new user
-            user = User(
+            # Encrypt before touching the database to keep it out of the transaction
+            encrypted_token = get_security_manager().encrypt(access_token) if access_token else None
+            
+            # Create the account or, if the email already exists and is not yet
+            # linked, link it in one INSERT ... ON CONFLICT (email_normalized) DO UPDATE.
+            # Already-linked rows are returned unchanged.
+            now = datetime.utcnow()
+            stmt = upsert_insert(User).values(
                 email=email,
                 first_name=first_name,
                 last_name=last_name,
                 role=UserRole.CEO,  # Default role
                 oauth_provider=provider,
                 oauth_id=oauth_id,
-                is_verified=True,  # OAuth emails are pre-verified
-                password_hash=None  # No password for OAuth-only users
+                oauth_token=encrypted_token,
+                is_verified=email_verified,
+                password_hash=None,  # No password for OAuth-only users
+                created_at=now,
+                updated_at=now
             )
+            # An unverified email must not claim someone else's account
+            unlinked = User.oauth_provider.is_(None) if email_verified else false()
+            link_values = {
+                'oauth_provider': case((unlinked, stmt.excluded.oauth_provider), else_=User.oauth_provider),
+                'oauth_id': case((unlinked, stmt.excluded.oauth_id), else_=User.oauth_id),
+                'is_verified': case((unlinked, True), else_=User.is_verified),
+                'updated_at': case((unlinked, now), else_=User.updated_at)
+            }
+            if encrypted_token:
+                link_values['oauth_token'] = case((unlinked, stmt.excluded.oauth_token), else_=User.oauth_token)
             
-            if access_token:
-                security_manager = get_security_manager()
-                user.oauth_token = security_manager.encrypt(access_token)
-            
-            db.session.add(user)
+            user = db.session.scalars(
+                stmt.on_conflict_do_update(index_elements=[User.email_normalized], set_=link_values)
+                .returning(User)
+                .execution_options(populate_existing=True)
+            ).one()
             db.session.commit()
             
-            logger.info(f"OAuth user created: {email}")
-            return user, True, "OAuth user created successfully"
+            if not email_verified and (user.oauth_provider, user.oauth_id) != (provider, oauth_id):
+                logger.warning(f"OAuth login refused, unverified email matches another account: {email}")
+                return None, False, "An account with this email already exists; sign in to it directly"
+            
+            if user.created_at == now:
+                logger.info(f"OAuth user created: {email}")
+                return user, True, "OAuth user created successfully"
+            
+            if user.updated_at == now:
+                logger.info(f"OAuth linked to existing account: {email}")
+            return user, True, "OAuth authentication successful"
             
         except Exception as e:
             db.session.rollback()
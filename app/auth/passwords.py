@@ -0,0 +1,132 @@
+"""
+Password hashing for Radar application.
+
+Hashes with the algorithm selected by PASSWORD_HASHER and verifies any hash
+format the application has produced, so the algorithm or its cost can be
+changed without invalidating existing passwords. Hashes made with other
+settings are reported by needs_rehash and upgraded on the next login.
+
+Supported hashers:
+- bcrypt: cost from BCRYPT_LOG_ROUNDS
+- argon2id: ARGON2_MEMORY_COST (KiB), ARGON2_TIME_COST, ARGON2_PARALLELISM
+- werkzeug: PASSWORD_HASH_METHOD (e.g. scrypt, pbkdf2:sha256)
+"""
+
+from flask import current_app
+from werkzeug.security import generate_password_hash, check_password_hash
+from argon2 import PasswordHasher
+from argon2.exceptions import InvalidHashError, VerificationError
+from functools import lru_cache
+import bcrypt
+
+
+BCRYPT_PREFIXES = ('$2a$', '$2b$', '$2y$')
+# bcrypt silently ignores everything after the first 72 bytes of input
+BCRYPT_MAX_BYTES = 72
+ARGON2_PREFIX = '$argon2'
+
+
+@lru_cache(maxsize=4)
+def _argon2_hasher(memory_cost: int, time_cost: int, parallelism: int) -> PasswordHasher:
+    """Return an argon2id hasher for the given parameters."""
+    return PasswordHasher(memory_cost=memory_cost, time_cost=time_cost, parallelism=parallelism)
+
+
+def _configured_argon2() -> PasswordHasher:
+    config = current_app.config
+    return _argon2_hasher(
+        config.get('ARGON2_MEMORY_COST', 46 * 1024),
+        config.get('ARGON2_TIME_COST', 1),
+        config.get('ARGON2_PARALLELISM', 1)
+    )
+
+
+def hash_password(password: str) -> str:
+    """
+    Hash a password with the configured hasher.
+
+    Args:
+        password: Plaintext password
+
+    Returns:
+        Password hash string
+
+    Raises:
+        ValueError: If the password is too long for the configured hasher
+    """
+    config = current_app.config
+    hasher = config.get('PASSWORD_HASHER', 'werkzeug')
+
+    if hasher == 'bcrypt':
+        if len(password.encode('utf-8')) > BCRYPT_MAX_BYTES:
+            raise ValueError(f"Password exceeds {BCRYPT_MAX_BYTES} bytes, the bcrypt input limit")
+        salt = bcrypt.gensalt(rounds=config.get('BCRYPT_LOG_ROUNDS', 12))
+        return bcrypt.hashpw(password.encode('utf-8'), salt).decode('ascii')
+    if hasher == 'argon2id':
+        return _configured_argon2().hash(password)
+    if hasher == 'werkzeug':
+        return generate_password_hash(
+            password,
+            method=config.get('PASSWORD_HASH_METHOD', 'scrypt'),
+            salt_length=config.get('PASSWORD_SALT_LENGTH', 16)
+        )
+    raise ValueError(f"Unknown password hasher: {hasher}")
+
+
+def verify_password(password_hash: str, password: str) -> bool:
+    """
+    Verify a password against a hash of any supported format.
+
+    Args:
+        password_hash: Stored password hash
+        password: Plaintext password to verify
+
+    Returns:
+        True if password matches, False otherwise
+    """
+    if password_hash.startswith(BCRYPT_PREFIXES):
+        # hash_password never hashes longer input, so anything longer would
+        # only match by truncation
+        if len(password.encode('utf-8')) > BCRYPT_MAX_BYTES:
+            return False
+        try:
+            return bcrypt.checkpw(password.encode('utf-8'), password_hash.encode('ascii'))
+        except ValueError:
+            return False
+    if password_hash.startswith(ARGON2_PREFIX):
+        try:
+            # Verification does not depend on the configured parameters
+            return _configured_argon2().verify(password_hash, password)
+        except (VerificationError, InvalidHashError):
+            return False
+    return check_password_hash(password_hash, password)
+
+
+def needs_rehash(password_hash: str) -> bool:
+    """
+    Check whether a hash was made with a different hasher or cost than configured.
+
+    Args:
+        password_hash: Stored password hash
+
+    Returns:
+        True if the password should be hashed again
+    """
+    config = current_app.config
+    hasher = config.get('PASSWORD_HASHER', 'werkzeug')
+
+    if hasher == 'bcrypt':
+        if not password_hash.startswith(BCRYPT_PREFIXES):
+            return True
+        # $2b$<rounds>$<salt+hash>
+        return int(password_hash[4:6]) != config.get('BCRYPT_LOG_ROUNDS', 12)
+    if hasher == 'argon2id':
+        if not password_hash.startswith('$argon2id$'):
+            return True
+        try:
+            return _configured_argon2().check_needs_rehash(password_hash)
+        except InvalidHashError:
+            return True
+    # werkzeug hashes start with their method string, e.g. scrypt:32768:8:1$...
+    method = password_hash.split('$', 1)[0]
+    return not method.startswith(config.get('PASSWORD_HASH_METHOD', 'scrypt'))
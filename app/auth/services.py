@@ -6,19 +6,171 @@ Implements business logic for authentication, authorization, and user management
 
 from app.extensions import db
 from app.auth.models import User, UserRole, PasswordResetToken
-from app.utils.security import get_security_manager, validate_email, sanitize_input
-from app.utils.validators import validate_password, validate_role
+from app.auth.passwords import hash_password
+from app.utils.security import get_security_manager, sanitize_input
+from app.utils.validators import validate_email, validate_password, validate_role, ValidationError
 from flask_jwt_extended import create_access_token, create_refresh_token, get_jwt_identity, get_jwt
 from flask_login import login_user
-from datetime import datetime, timedelta
+from flask import current_app
+from cachetools import TTLCache
+from sqlalchemy import event, insert, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session, make_transient_to_detached, object_session
+from sqlalchemy.orm.attributes import set_committed_value
+from datetime import datetime, timedelta, timezone
+import base64
+import hmac
 import secrets
 import hashlib
+import threading
+import time
 from typing import Optional, Tuple, Dict, Any
 import logging
 
 
 logger = logging.getLogger(__name__)
 
+# Dialect-specific INSERT constructs supporting ON CONFLICT
+_UPSERT_INSERTS = {
+    'postgresql': postgresql.insert,
+    'sqlite': sqlite.insert,
+}
+
+# Access tokens issued on refresh, keyed by (user id, token version, claims)
+ACCESS_TOKEN_CACHE_TTL = 30
+_ACCESS_TOKEN_CACHE = TTLCache(maxsize=10000, ttl=ACCESS_TOKEN_CACHE_TTL)
+_ACCESS_TOKEN_LOCK = threading.Lock()
+
+# Column values of recently loaded users, keyed by user id. Entries are
+# dropped when this process updates the user; other workers see changes
+# within USER_CACHE_TTL seconds.
+USER_CACHE_TTL = 2
+_USER_CACHE = TTLCache(maxsize=50000, ttl=USER_CACHE_TTL)
+_USER_CACHE_LOCK = threading.Lock()
+_USER_COLUMNS = tuple(column.key for column in User.__table__.columns)
+_USER_CACHE_PENDING = '_user_cache_pending'
+
+# Recently rejected (email, password) pairs, keyed by a keyed BLAKE2b digest
+# so plaintext passwords are never held. A repeat within the TTL is rejected
+# without running the password hash again.
+FAILED_LOGIN_CACHE_TTL = 1
+_FAILED_LOGIN_CACHE = TTLCache(maxsize=10000, ttl=FAILED_LOGIN_CACHE_TTL)
+_FAILED_LOGIN_LOCK = threading.Lock()
+
+
+def upsert_insert(model):
+    """
+    Build an INSERT for model that supports ON CONFLICT on the session's dialect.
+    
+    Args:
+        model: Mapped class to insert into
+        
+    Returns:
+        Dialect Insert construct
+    """
+    return _UPSERT_INSERTS[db.session.get_bind().dialect.name](model)
+
+
+def _failed_login_key(email: str, password: str) -> bytes:
+    """Digest identifying an email/password pair for the failed login cache."""
+    key = hashlib.blake2b(current_app.config['SECRET_KEY'].encode(), person=b'failed-login').digest()
+    return hashlib.blake2b(f"{email}\0{password}".encode(), digest_size=16, key=key).digest()
+
+
+def _invalidate_cached_user(user_id: Optional[str] = None):
+    """Drop one cached user, or every cached user when user_id is None."""
+    with _USER_CACHE_LOCK:
+        if user_id is None:
+            _USER_CACHE.clear()
+        else:
+            _USER_CACHE.pop(user_id, None)
+
+
+@event.listens_for(User, 'after_update')
+@event.listens_for(User, 'after_delete')
+def _user_changed(mapper, connection, target):
+    """Invalidate a flushed user now and again once the transaction commits."""
+    _invalidate_cached_user(target.id)
+    session = object_session(target)
+    if session is not None:
+        session.info.setdefault(_USER_CACHE_PENDING, set()).add(target.id)
+
+
+@event.listens_for(Session, 'do_orm_execute')
+def _user_statement_executed(orm_execute_state):
+    """Invalidate all cached users on bulk UPDATE/DELETE/upsert against users."""
+    statement = orm_execute_state
+    if (statement.is_update or statement.is_delete or statement.is_insert) and statement.bind_mapper is User.__mapper__:
+        _invalidate_cached_user()
+        statement.session.info.setdefault(_USER_CACHE_PENDING, set()).add(None)
+
+
+@event.listens_for(Session, 'after_commit')
+def _user_transaction_committed(session):
+    """Repeat invalidation after commit so rows cached mid-transaction are dropped."""
+    for user_id in session.info.pop(_USER_CACHE_PENDING, ()):
+        _invalidate_cached_user(user_id)
+
+
+@event.listens_for(Session, 'after_soft_rollback')
+def _user_transaction_rolled_back(session, previous_transaction):
+    """Drop users cached from flushed changes that were rolled back."""
+    pending = session.info.get(_USER_CACHE_PENDING, ())
+    for user_id in pending:
+        _invalidate_cached_user(user_id)
+    # A savepoint rollback leaves the outer transaction's changes to commit
+    if previous_transaction.parent is None:
+        session.info.pop(_USER_CACHE_PENDING, None)
+
+
+def _sign_reset_payload(payload: str) -> str:
+    """Return the truncated HMAC-SHA256 signature for a reset token payload."""
+    key = current_app.config['SECRET_KEY'].encode()
+    digest = hmac.new(key, b'password-reset:' + payload.encode(), hashlib.sha256).digest()
+    return base64.urlsafe_b64encode(digest[:16]).rstrip(b'=').decode()
+
+
+def _make_reset_token(expires_at: datetime) -> str:
+    """
+    Build a password reset token as "<nonce>.<expiry>.<signature>".
+    
+    Args:
+        expires_at: Token expiration time (UTC)
+        
+    Returns:
+        Signed token string
+    """
+    payload = f"{secrets.token_urlsafe(24)}.{int(expires_at.replace(tzinfo=timezone.utc).timestamp())}"
+    return f"{payload}.{_sign_reset_payload(payload)}"
+
+
+def _reset_token_is_authentic(token: str) -> bool:
+    """
+    Check a reset token's signature and expiry without touching the database.
+    
+    Args:
+        token: Token string from the reset request
+        
+    Returns:
+        True if the token was issued by this app and has not expired
+    """
+    if not isinstance(token, str):
+        return False
+    payload, _, signature = token.rpartition('.')
+    expires_ts = payload.rpartition('.')[2]
+    if not expires_ts.isdigit() or int(expires_ts) < time.time():
+        return False
+    return hmac.compare_digest(signature.encode(), _sign_reset_payload(payload).encode())
+
+
+def _token_claims(user: User) -> Dict[str, Any]:
+    """Build the additional JWT claims for a user."""
+    return {
+        'role': user.role.value if user.role else None,
+        'email': user.email,
+        'mfa_enabled': user.mfa_enabled
+    }
+
 
 class AuthService:
     """Service for authentication and user management operations."""
@@ -46,34 +198,35 @@ class AuthService:
         """
         try:
             # Validate inputs
-            email = validate_email(email.strip().lower())
+            email = validate_email(email)
             validate_password(password)
             validate_role(role)
             first_name = sanitize_input(first_name.strip())
             last_name = sanitize_input(last_name.strip())
             
-            # Check if user already exists
-            existing_user = User.query.filter_by(email=email).first()
-            if existing_user:
-                return None, False, "User with this email already exists"
-            
-            # Create user
-            user = User(
-                email=email,
-                first_name=first_name,
-                last_name=last_name,
-                role=UserRole[role.upper()]
-            )
-            user.set_password(password)
-            user.is_verified = False  # Require email verification
-            
-            db.session.add(user)
+            # Insert unless the email is taken, in one atomic statement
+            user = db.session.scalars(
+                upsert_insert(User).values(
+                    email=email,
+                    first_name=first_name,
+                    last_name=last_name,
+                    role=UserRole[role.upper()],
+                    password_hash=hash_password(password),
+                    password_changed_at=datetime.utcnow(),
+                    is_verified=False  # Require email verification
+                )
+                .on_conflict_do_nothing(index_elements=[User.email_normalized])
+                .returning(User)
+            ).one_or_none()
             db.session.commit()
             
+            if user is None:
+                return None, False, "User with this email already exists"
+            
             logger.info(f"User registered: {email}")
             return user, True, "User registered successfully"
             
-        except ValueError as e:
+        except (ValueError, ValidationError) as e:
             return None, False, str(e)
         except Exception as e:
             db.session.rollback()
@@ -96,12 +249,12 @@ class AuthService:
             email = email.strip().lower()
             
             # Find user
-            user = User.query.filter_by(email=email).first()
+            user = User.query.filter(User.email_normalized == email).first()
             if not user:
                 return None, False, "Invalid email or password"
             
             # Check if account is locked
-            if user.is_locked():
+            if user.is_locked:
                 remaining_time = (user.locked_until - datetime.utcnow()).total_seconds() / 60
                 return None, False, f"Account is locked. Please try again in {int(remaining_time)} minutes."
             
@@ -109,19 +262,27 @@ class AuthService:
             if not user.is_active:
                 return None, False, "Account is deactivated. Please contact support."
             
-            # Verify password
-            if not user.check_password(password):
+            # Verify password (pairs rejected within the last second skip the hash)
+            failed_key = _failed_login_key(email, password)
+            with _FAILED_LOGIN_LOCK:
+                recently_failed = failed_key in _FAILED_LOGIN_CACHE
+            if recently_failed or not user.check_password(password):
                 user.record_failed_login(max_attempts=5)
+                db.session.commit()
+                with _FAILED_LOGIN_LOCK:
+                    _FAILED_LOGIN_CACHE[failed_key] = True
                 return None, False, "Invalid email or password"
             
             # Successful login
             user.record_successful_login()
+            db.session.commit()
             login_user(user, remember=False)
             
             logger.info(f"User authenticated: {email}")
             return user, True, "Authentication successful"
             
         except Exception as e:
+            db.session.rollback()
             logger.error(f"Error authenticating user: {str(e)}", exc_info=True)
             return None, False, "An error occurred during authentication"
     
@@ -137,11 +298,7 @@ class AuthService:
             Dictionary with access_token and refresh_token
         """
         # Create token claims
-        additional_claims = {
-            'role': user.role.value if user.role else None,
-            'email': user.email,
-            'mfa_enabled': user.mfa_enabled
-        }
+        additional_claims = _token_claims(user)
         
         # Create tokens
         access_token = create_access_token(
@@ -158,6 +315,33 @@ class AuthService:
             'refresh_token': refresh_token
         }
     
+    @staticmethod
+    def refresh_access_token(user: User) -> str:
+        """
+        Issue an access token for a refresh, reusing a recently signed one.
+        
+        Tokens are cached per user, token version and claim values for
+        ACCESS_TOKEN_CACHE_TTL seconds, so bursts of refreshes sign once.
+        Bumping user.token_version or changing a claim misses the cache.
+        
+        Args:
+            user: User object
+            
+        Returns:
+            Encoded access token
+        """
+        additional_claims = _token_claims(user)
+        cache_key = (user.id, user.token_version or 0, tuple(additional_claims.values()))
+        
+        with _ACCESS_TOKEN_LOCK:
+            access_token = _ACCESS_TOKEN_CACHE.get(cache_key)
+        if access_token is None:
+            access_token = create_access_token(identity=user.id, additional_claims=additional_claims)
+            with _ACCESS_TOKEN_LOCK:
+                _ACCESS_TOKEN_CACHE[cache_key] = access_token
+        
+        return access_token
+    
     @staticmethod
     def create_password_reset_token(email: str) -> Tuple[Optional[PasswordResetToken], bool, str]:
         """
@@ -171,27 +355,38 @@ class AuthService:
         """
         try:
             email = email.strip().lower()
-            user = User.query.filter_by(email=email).first()
+            user = User.query.filter(User.email_normalized == email).first()
             
             if not user:
                 # Don't reveal if user exists for security
                 return None, True, "If an account exists with this email, a password reset link has been sent"
             
-            # Generate secure token
-            token = secrets.token_urlsafe(32)
+            # Generate secure, signed token
             expires_at = datetime.utcnow() + timedelta(hours=1)  # 1 hour expiration
+            token = _make_reset_token(expires_at)
             
-            # Invalidate existing tokens for this user
-            PasswordResetToken.query.filter_by(user_id=user.id, used=False).update({'used': True})
-            
-            # Create new token
-            reset_token = PasswordResetToken(
-                user_id=user.id,
-                token=token,
-                expires_at=expires_at
+            # Invalidate existing tokens for this user and create the new one
+            invalidate = (
+                update(PasswordResetToken)
+                .where(PasswordResetToken.user_id == user.id, PasswordResetToken.used.is_(False))
+                .values(used=True)
             )
-            
-            db.session.add(reset_token)
+            if db.session.get_bind().dialect.name == 'postgresql':
+                # One statement: WITH invalidated AS (UPDATE ...) INSERT ... RETURNING
+                reset_token = db.session.scalars(
+                    insert(PasswordResetToken)
+                    .values(user_id=user.id, token=token, expires_at=expires_at)
+                    .add_cte(invalidate.cte('invalidated'))
+                    .returning(PasswordResetToken)
+                ).one()
+            else:
+                db.session.execute(invalidate)
+                reset_token = PasswordResetToken(
+                    user_id=user.id,
+                    token=token,
+                    expires_at=expires_at
+                )
+                db.session.add(reset_token)
             db.session.commit()
             
             logger.info(f"Password reset token created for: {email}")
@@ -217,6 +412,10 @@ class AuthService:
         try:
             validate_password(new_password)
             
+            # Forged, malformed or expired tokens are rejected without a query
+            if not _reset_token_is_authentic(token):
+                return False, "Invalid or expired reset token"
+            
             # Find token
             reset_token = PasswordResetToken.query.filter_by(token=token, used=False).first()
             if not reset_token:
@@ -237,7 +436,7 @@ class AuthService:
             logger.info(f"Password reset for user: {user.email}")
             return True, "Password reset successful"
             
-        except ValueError as e:
+        except (ValueError, ValidationError) as e:
             return False, str(e)
         except Exception as e:
             db.session.rollback()
@@ -271,7 +470,7 @@ class AuthService:
             logger.info(f"Password changed for user: {user.email}")
             return True, "Password changed successfully"
             
-        except ValueError as e:
+        except (ValueError, ValidationError) as e:
             return False, str(e)
         except Exception as e:
             db.session.rollback()
@@ -279,17 +478,44 @@ class AuthService:
             return False, "An error occurred while changing password"
     
     @staticmethod
-    def get_user_by_id(user_id: str) -> Optional[User]:
+    def get_user_by_id(user_id: str, fresh: bool = False) -> Optional[User]:
         """
         Get user by ID.
         
+        Cached rows can be up to USER_CACHE_TTL seconds behind changes made
+        by other workers; pass fresh=True when checking credentials.
+        
         Args:
             user_id: User ID
+            fresh: Skip the user cache and load from the session/database
             
         Returns:
             User object or None
         """
-        return User.query.filter_by(id=user_id).first()
+        row = None
+        if not fresh:
+            with _USER_CACHE_LOCK:
+                row = _USER_CACHE.get(user_id)
+        
+        if row is None:
+            # Primary key lookup; served from the identity map when already loaded
+            user = db.session.get(User, user_id)
+            # Only cache committed state: not unflushed edits, nor flushed
+            # changes this transaction could still roll back
+            pending = db.session.info.get(_USER_CACHE_PENDING, ())
+            if (user is not None and not db.session.is_modified(user)
+                    and user_id not in pending and None not in pending):
+                with _USER_CACHE_LOCK:
+                    _USER_CACHE[user_id] = {key: getattr(user, key) for key in _USER_COLUMNS}
+            return user
+        
+        # Rebuild a clean, detached instance from the cached columns and attach
+        # it without a SELECT (returns the session's copy if already loaded)
+        cached = User.__mapper__.class_manager.new_instance()
+        for key, value in row.items():
+            set_committed_value(cached, key, list(value) if isinstance(value, list) else value)
+        make_transient_to_detached(cached)
+        return db.session.merge(cached, load=False)
     
     @staticmethod
     def get_user_by_email(email: str) -> Optional[User]:
@@ -302,4 +528,4 @@ class AuthService:
         Returns:
             User object or None
         """
-        return User.query.filter_by(email=email.strip().lower()).first()
+        return User.query.filter(User.email_normalized == email.strip().lower()).first()
@@ -6,13 +6,38 @@ company intake and competitor tracking.
 """
 
 from app.extensions import db
-from datetime import datetime, timedelta
+from app.utils.json_provider import dumps_text
+from datetime import datetime
+from dateutil.relativedelta import relativedelta
 import uuid
+import copy
 import enum
-import json
+import orjson
 from typing import List, Dict, Any, Optional
 
 
+def _decode_json_column(instance: Any, column: str) -> Any:
+    """
+    Decode a JSON text column, reusing the previous decode while the raw value is unchanged.
+    
+    Args:
+        instance: Model instance
+        column: Name of the JSON text column
+        
+    Returns:
+        Shallow copy of the decoded value
+    
+    Raises:
+        orjson.JSONDecodeError, TypeError: If the column does not hold valid JSON
+    """
+    raw = getattr(instance, column)
+    cache = instance.__dict__.setdefault('_json_cache', {})
+    cached = cache.get(column)
+    if cached is None or cached[0] is not raw:
+        cached = cache[column] = (raw, orjson.loads(raw))
+    return copy.copy(cached[1])
+
+
 class ReportFrequency(enum.Enum):
     """Report frequency enumeration."""
     QUARTERLY = 'quarterly'
@@ -30,7 +55,7 @@ class Company(db.Model):
     __tablename__ = 'companies'
     
     id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
-    user_id = db.Column(db.String(36), db.ForeignKey('users.id'), nullable=False, index=True)
+    user_id = db.Column(db.String(36), db.ForeignKey('users.id'), nullable=False)
     
     # Company information
     name = db.Column(db.String(255), nullable=False)
@@ -44,9 +69,14 @@ class Company(db.Model):
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
     
     # Relationships
-    competitors = db.relationship('Competitor', backref='company', lazy='dynamic', cascade='all, delete-orphan')
+    competitors = db.relationship('Competitor', backref='company', lazy='select', cascade='all, delete-orphan')
     tracking_config = db.relationship('TrackingConfig', backref='company', uselist=False, cascade='all, delete-orphan')
-    reports = db.relationship('Report', backref='company', lazy='dynamic', cascade='all, delete-orphan')
+    reports = db.relationship('Report', backref='company', lazy='select', cascade='all, delete-orphan')
+    
+    # Ownership listing and duplicate checks filter on (user_id, website_url)
+    __table_args__ = (
+        db.Index('idx_companies_user_website', 'user_id', 'website_url'),
+    )
     
     def get_keywords(self) -> List[str]:
         """
@@ -58,8 +88,8 @@ class Company(db.Model):
         if not self.keywords:
             return []
         try:
-            return json.loads(self.keywords)
-        except (json.JSONDecodeError, TypeError):
+            return _decode_json_column(self, 'keywords')
+        except (orjson.JSONDecodeError, TypeError):
             return []
     
     def set_keywords(self, keywords: List[str]):
@@ -69,7 +99,7 @@ class Company(db.Model):
         Args:
             keywords: List of keyword strings
         """
-        self.keywords = json.dumps(keywords) if keywords else None
+        self.keywords = dumps_text(keywords) if keywords else None
     
     def to_dict(self) -> dict:
         """
@@ -86,8 +116,8 @@ class Company(db.Model):
             'industry': self.industry,
             'description': self.description,
             'keywords': self.get_keywords(),
-            'created_at': self.created_at.isoformat() if self.created_at else None,
-            'updated_at': self.updated_at.isoformat() if self.updated_at else None
+            'created_at': self.created_at,
+            'updated_at': self.updated_at
         }
     
     def __repr__(self):
@@ -105,7 +135,7 @@ class Competitor(db.Model):
     __tablename__ = 'competitors'
     
     id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
-    company_id = db.Column(db.String(36), db.ForeignKey('companies.id'), nullable=False, index=True)
+    company_id = db.Column(db.String(36), db.ForeignKey('companies.id'), nullable=False)
     
     # Competitor information
     name = db.Column(db.String(255), nullable=False)
@@ -128,6 +158,11 @@ class Competitor(db.Model):
     intelligence_data = db.relationship('IntelligenceData', backref='competitor', lazy='dynamic', cascade='all, delete-orphan')
     startups = db.relationship('Startup', backref='competitor', lazy='dynamic', cascade='all, delete-orphan')
     
+    # Listing and duplicate checks filter on (company_id, website_url)
+    __table_args__ = (
+        db.Index('idx_competitors_company_website', 'company_id', 'website_url'),
+    )
+    
     def approve(self):
         """Mark competitor as approved by user."""
         self.approved_by_user = True
@@ -156,9 +191,9 @@ class Competitor(db.Model):
             'confidence_score': self.confidence_score,
             'discovery_source': self.discovery_source,
             'approved_by_user': self.approved_by_user,
-            'approved_at': self.approved_at.isoformat() if self.approved_at else None,
-            'created_at': self.created_at.isoformat() if self.created_at else None,
-            'updated_at': self.updated_at.isoformat() if self.updated_at else None
+            'approved_at': self.approved_at,
+            'created_at': self.created_at,
+            'updated_at': self.updated_at
         }
     
     def __repr__(self):
@@ -211,8 +246,8 @@ class TrackingConfig(db.Model):
                 'traffic_growth_spike': 0.2  # Trigger on 20% traffic growth
             }
         try:
-            return json.loads(self.alert_thresholds)
-        except (json.JSONDecodeError, TypeError):
+            return _decode_json_column(self, 'alert_thresholds')
+        except (orjson.JSONDecodeError, TypeError):
             return {}
     
     def set_alert_thresholds(self, thresholds: Dict[str, Any]):
@@ -222,7 +257,7 @@ class TrackingConfig(db.Model):
         Args:
             thresholds: Dictionary of alert thresholds
         """
-        self.alert_thresholds = json.dumps(thresholds) if thresholds else None
+        self.alert_thresholds = dumps_text(thresholds) if thresholds else None
     
     def get_email_recipients(self) -> List[str]:
         """
@@ -234,8 +269,8 @@ class TrackingConfig(db.Model):
         if not self.email_recipients:
             return []
         try:
-            return json.loads(self.email_recipients)
-        except (json.JSONDecodeError, TypeError):
+            return _decode_json_column(self, 'email_recipients')
+        except (orjson.JSONDecodeError, TypeError):
             return []
     
     def set_email_recipients(self, recipients: List[str]):
@@ -245,7 +280,7 @@ class TrackingConfig(db.Model):
         Args:
             recipients: List of email addresses
         """
-        self.email_recipients = json.dumps(recipients) if recipients else None
+        self.email_recipients = dumps_text(recipients) if recipients else None
     
     def calculate_next_report_date(self) -> datetime:
         """
@@ -257,20 +292,17 @@ class TrackingConfig(db.Model):
         base_date = self.last_report_generated_at or datetime.utcnow()
         
         if self.report_frequency == ReportFrequency.QUARTERLY:
-            # Add 3 months
-            next_date = base_date + timedelta(days=90)
+            next_date = base_date + relativedelta(months=3)
         elif self.report_frequency == ReportFrequency.MONTHLY:
-            # Add 1 month
-            next_date = base_date + timedelta(days=30)
+            next_date = base_date + relativedelta(months=1)
         else:  # ON_DEMAND
             next_date = None
         
         return next_date
     
     def update_next_report_date(self):
-        """Update next report due date based on current frequency."""
+        """Update next report due date based on current frequency (caller commits)."""
         self.next_report_due_at = self.calculate_next_report_date()
-        db.session.commit()
     
     def mark_report_generated(self):
         """Mark report as generated and update next due date."""
@@ -291,10 +323,10 @@ class TrackingConfig(db.Model):
             'report_frequency': self.report_frequency.value if self.report_frequency else None,
             'alert_thresholds': self.get_alert_thresholds(),
             'email_recipients': self.get_email_recipients(),
-            'last_report_generated_at': self.last_report_generated_at.isoformat() if self.last_report_generated_at else None,
-            'next_report_due_at': self.next_report_due_at.isoformat() if self.next_report_due_at else None,
-            'created_at': self.created_at.isoformat() if self.created_at else None,
-            'updated_at': self.updated_at.isoformat() if self.updated_at else None
+            'last_report_generated_at': self.last_report_generated_at,
+            'next_report_due_at': self.next_report_due_at,
+            'created_at': self.created_at,
+            'updated_at': self.updated_at
         }
     
     def __repr__(self):
@@ -4,13 +4,14 @@ Company and competitor routes for Radar application.
 Handles company onboarding, competitor discovery, and management.
 """
 
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, request, jsonify, current_app, stream_with_context
 from flask_jwt_extended import get_jwt_identity
 from app.extensions import db, limiter
 from app.auth.decorators import requires_authentication
 from app.companies.models import Company, Competitor, TrackingConfig, ReportFrequency
 from app.companies.services import CompanyService, CompetitorDiscoveryService
 from app.utils.validators import ValidationError
+from itertools import chain, islice
 import logging
 
 
@@ -18,6 +19,63 @@ logger = logging.getLogger(__name__)
 
 companies_bp = Blueprint('companies', __name__)
 
+# Lists longer than this are streamed instead of built in memory
+STREAM_THRESHOLD = 50
+
+
+def _json_list_response(key: str, query, chunk_size: int = 500):
+    """
+    Serialize query results as {key: [...]}, streaming large result sets.
+    
+    Rows are loaded in batches of chunk_size. Up to STREAM_THRESHOLD rows
+    are returned as a normal JSON response; longer lists are written to the
+    client batch by batch, so the full list is never held in memory.
+    
+    Args:
+        key: Top-level key for the list
+        query: Query whose rows have a to_dict method
+        chunk_size: Rows fetched and written per batch
+        
+    Returns:
+        Tuple of (Flask Response, status code)
+    """
+    rows = iter(query.yield_per(chunk_size))
+    head = list(islice(rows, STREAM_THRESHOLD + 1))
+    if len(head) <= STREAM_THRESHOLD:
+        return jsonify({key: [row.to_dict() for row in head]}), 200
+    
+    dumps = current_app.json.dumps
+    
+    def generate():
+        yield b'{' + dumps(key).encode() + b':['
+        separator = b''
+        batch = []
+        for row in chain(head, rows):
+            batch.append(dumps(row.to_dict()).encode())
+            if len(batch) >= chunk_size:
+                yield separator + b','.join(batch)
+                separator = b','
+                batch = []
+        if batch:
+            yield separator + b','.join(batch)
+        yield b']}\n'
+    
+    return current_app.response_class(stream_with_context(generate()), mimetype='application/json'), 200
+
+
+def _owned_company_id(company_id: str, user_id: str):
+    """
+    Check company ownership without loading the company row.
+    
+    Args:
+        company_id: Company ID
+        user_id: ID of the requesting user
+        
+    Returns:
+        Company ID if the user owns the company, None otherwise
+    """
+    return db.session.query(Company.id).filter_by(id=company_id, user_id=user_id).scalar()
+
 
 @companies_bp.route('', methods=['POST'])
 @requires_authentication
@@ -68,11 +126,7 @@ def get_companies():
     """Get all companies for current user."""
     try:
         user_id = get_jwt_identity()
-        companies = Company.query.filter_by(user_id=user_id).all()
-        
-        return jsonify({
-            'companies': [company.to_dict() for company in companies]
-        }), 200
+        return _json_list_response('companies', Company.query.filter_by(user_id=user_id))
         
     except Exception as e:
         logger.error(f"Error getting companies: {str(e)}", exc_info=True)
@@ -100,18 +154,8 @@ def discover_competitors(company_id):
         competitors = CompetitorDiscoveryService.discover_competitors(company, max_results=5)
         
         # Create competitor records (pending approval)
-        created_competitors = []
-        for comp_data in competitors:
-            competitor, success, message = CompetitorDiscoveryService.create_competitor(
-                company_id=company_id,
-                name=comp_data.get('name'),
-                website_url=comp_data.get('website_url'),
-                discovery_rationale=comp_data.get('discovery_rationale'),
-                confidence_score=comp_data.get('confidence_score', 0),
-                discovery_source=comp_data.get('discovery_source', 'auto')
-            )
-            if success and competitor:
-                created_competitors.append(competitor.to_dict())
+        created, success, message = CompetitorDiscoveryService.create_competitors(company_id, competitors)
+        created_competitors = [competitor.to_dict() for competitor in created]
         
         logger.info(f"Competitor discovery completed for company: {company.name}")
         
@@ -131,16 +175,11 @@ def get_competitors(company_id):
     """Get all competitors for a company."""
     try:
         user_id = get_jwt_identity()
-        company = Company.query.filter_by(id=company_id, user_id=user_id).first()
         
-        if not company:
+        if not _owned_company_id(company_id, user_id):
             return jsonify({'error': 'Not Found', 'message': 'Company not found'}), 404
         
-        competitors = Competitor.query.filter_by(company_id=company_id).all()
-        
-        return jsonify({
-            'competitors': [comp.to_dict() for comp in competitors]
-        }), 200
+        return _json_list_response('competitors', Competitor.query.filter_by(company_id=company_id))
         
     except Exception as e:
         logger.error(f"Error getting competitors: {str(e)}", exc_info=True)
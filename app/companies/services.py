@@ -5,21 +5,65 @@ Implements business logic for company intake, competitor discovery,
 and competitor management.
 """
 
-from app.extensions import db
+from app.extensions import db, redis_client
 from app.companies.models import Company, Competitor, TrackingConfig, ReportFrequency
 from app.auth.models import User
 from app.utils.validators import validate_url, ValidationError
 from app.utils.security import sanitize_input
+from app.utils.http import create_session
+from flask import current_app
+from sqlalchemy import insert, update
 from typing import List, Dict, Any, Tuple, Optional
+import hashlib
 import logging
-import requests
-from bs4 import BeautifulSoup
-from urllib.parse import urlparse
+import orjson
+import redis
+from bs4 import BeautifulSoup, FeatureNotFound, SoupStrainer
+from urllib.parse import urlparse, urlunparse
+from cachetools import TTLCache
+from datetime import datetime
 import re
+import threading
 
 
 logger = logging.getLogger(__name__)
 
+# Only these tags (and their contents) are built when parsing company homepages
+COMPANY_INFO_TAGS = SoupStrainer(['title', 'h1', 'meta'])
+
+# Homepages are read up to this many bytes; the tags we need are near the top
+MAX_HTML_BYTES = 256 * 1024
+
+# Content types parsed as homepages (empty when the server sends none)
+_HTML_CONTENT_TYPES = frozenset(['text/html', 'application/xhtml+xml', ''])
+
+# Reading stops at the end of <head> once a <title> has been seen
+_HEAD_END = re.compile(rb'</head\s*>', re.IGNORECASE)
+_TITLE_START = re.compile(rb'<title[\s>]', re.IGNORECASE)
+
+# Site name is the part of <title> before "|", or before a spaced dash ("Acme - Home")
+_TITLE_SPLIT = re.compile(r'\s*\|\s*|\s+[-\u2013\u2014]\s+')
+_KEYWORD_SPLIT = re.compile(r'\s*,\s*')
+
+# <meta name="..."> values read from company homepages (matched case-insensitively)
+_META_NAMES = frozenset(['description', 'keywords'])
+
+# Recent extractions held in process (orjson bytes, keyed like the Redis cache),
+# so repeat onboarding of a site within a worker skips Redis as well
+COMPANY_INFO_LOCAL_TTL = 300
+_COMPANY_INFO_CACHE = TTLCache(maxsize=256, ttl=COMPANY_INFO_LOCAL_TTL)
+_COMPANY_INFO_LOCK = threading.Lock()
+
+# Shared keep-alive pool for fetching company and competitor homepages
+_SESSION = create_session(
+    pool_connections=32,
+    pool_maxsize=64,
+    retries=2,
+    backoff_factor=0.3,
+    status_forcelist=(429, 500, 502, 503, 504),
+    headers={'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'}
+)
+
 
 class CompanyService:
     """Service for company operations."""
@@ -47,17 +91,21 @@ class CompanyService:
             # Validate URL
             website_url = validate_url(website_url, require_https=False)
             
+            # Check if company already exists for user (before scraping the site);
+            # only the id is selected unless there is a match to return
+            existing_id = db.session.query(Company.id).filter_by(
+                user_id=user_id,
+                website_url=website_url
+            ).limit(1).scalar()
+            if existing_id:
+                return db.session.get(Company, existing_id), True, "Company already exists"
+            
             # Extract company information
             company_info = CompanyService._extract_company_info(website_url)
             
             # Use provided name or extracted name
             company_name = name or company_info.get('name', 'Unknown Company')
             
-            # Check if company already exists for user
-            existing = Company.query.filter_by(user_id=user_id, website_url=website_url).first()
-            if existing:
-                return existing, True, "Company already exists"
-            
             # Create company
             company = Company(
                 user_id=user_id,
@@ -69,9 +117,9 @@ class CompanyService:
             )
             
             db.session.add(company)
-            db.session.commit()
+            db.session.flush()  # Assigns company.id without committing
             
-            # Create default tracking config
+            # Create default tracking config in the same transaction
             tracking_config = TrackingConfig(
                 company_id=company.id,
                 report_frequency=ReportFrequency.QUARTERLY
@@ -104,45 +152,72 @@ class CompanyService:
         Returns:
             Dictionary with company information
         """
+        # Successful extractions are cached for REDIS_CACHE_TTL seconds per URL
+        cache_key = 'cinfo:' + hashlib.blake2b(
+            CompanyService._normalize_url(website_url).encode(),
+            digest_size=16
+        ).hexdigest()
+        with _COMPANY_INFO_LOCK:
+            cached = _COMPANY_INFO_CACHE.get(cache_key)
+        if cached:
+            return orjson.loads(cached)
+        
         try:
-            # Fetch webpage
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-            }
-            response = requests.get(website_url, headers=headers, timeout=10)
-            response.raise_for_status()
-            
-            # Parse HTML
-            soup = BeautifulSoup(response.text, 'html.parser')
+            cached = redis_client.get(cache_key)
+            if cached:
+                with _COMPANY_INFO_LOCK:
+                    _COMPANY_INFO_CACHE[cache_key] = cached
+                return orjson.loads(cached)
+        except redis.RedisError as e:
+            logger.warning(f"Company info cache unavailable: {str(e)}")
+        
+        try:
+            # Fetch webpage (connect, read timeouts)
+            with _SESSION.get(website_url, timeout=(3.05, 10), stream=True) as response:
+                response.raise_for_status()
+                
+                # Don't download or parse PDFs, JSON, images etc.
+                content_type = response.headers.get('Content-Type', '').split(';', 1)[0].strip().lower()
+                if content_type not in _HTML_CONTENT_TYPES:
+                    raise ValueError(f"Unsupported content type: {content_type}")
+                
+                html = CompanyService._read_head(response)
+            
+            # Parse HTML; raw bytes let the parser pick up the page's declared encoding
+            try:
+                soup = BeautifulSoup(html, 'lxml', parse_only=COMPANY_INFO_TAGS)
+            except FeatureNotFound:
+                soup = BeautifulSoup(html, 'html.parser', parse_only=COMPANY_INFO_TAGS)
             
             # Extract name from title or h1
             name = None
             title_tag = soup.find('title')
             if title_tag:
-                name = title_tag.get_text().strip().split('|')[0].strip()
+                name = _TITLE_SPLIT.split(title_tag.get_text().strip(), maxsplit=1)[0]
             
             if not name:
                 h1_tag = soup.find('h1')
                 if h1_tag:
                     name = h1_tag.get_text().strip()
             
-            # Extract description from meta description
-            description = None
-            meta_desc = soup.find('meta', attrs={'name': 'description'})
-            if meta_desc:
-                description = meta_desc.get('content', '').strip()
+            # Collect meta description and keywords in one pass (first tag of each wins)
+            meta_by_name = {}
+            for meta in soup.find_all('meta'):
+                meta_name = (meta.get('name') or '').lower()
+                if meta_name in _META_NAMES and meta_name not in meta_by_name:
+                    meta_by_name[meta_name] = meta.get('content', '').strip()
+            
+            description = meta_by_name.get('description')
             
-            # Extract keywords from meta keywords
             keywords = []
-            meta_keywords = soup.find('meta', attrs={'name': 'keywords'})
-            if meta_keywords:
-                keywords = [k.strip() for k in meta_keywords.get('content', '').split(',')]
+            if 'keywords' in meta_by_name:
+                keywords = _KEYWORD_SPLIT.split(meta_by_name['keywords'], maxsplit=10)[:10]
             
             # Extract industry (basic heuristic)
             industry = None
             # Could be enhanced with industry classification APIs
             
-            return {
+            info = {
                 'name': name,
                 'description': description,
                 'keywords': keywords[:10],  # Limit to top 10
@@ -157,6 +232,62 @@ class CompanyService:
                 'keywords': [],
                 'industry': None
             }
+        
+        serialized = orjson.dumps(info)
+        with _COMPANY_INFO_LOCK:
+            _COMPANY_INFO_CACHE[cache_key] = serialized
+        try:
+            redis_client.setex(cache_key, current_app.config.get('REDIS_CACHE_TTL', 3600), serialized)
+        except redis.RedisError as e:
+            logger.warning(f"Company info cache unavailable: {str(e)}")
+        
+        return info
+    
+    @staticmethod
+    def _normalize_url(url: str) -> str:
+        """
+        Normalize URL for cache keys (lowercase scheme and host, no trailing slash or fragment).
+        
+        Args:
+            url: Validated URL
+            
+        Returns:
+            Normalized URL string
+        """
+        parsed = urlparse(url)
+        return urlunparse((
+            parsed.scheme.lower(),
+            parsed.netloc.lower(),
+            parsed.path.rstrip('/'),
+            parsed.params,
+            parsed.query,
+            ''
+        ))
+    
+    @staticmethod
+    def _read_head(response) -> bytes:
+        """
+        Read the start of a streamed HTML response.
+        
+        Stops after MAX_HTML_BYTES, or at </head> if a <title> was seen
+        (otherwise the first <h1> in the body is still needed).
+        
+        Args:
+            response: Streamed requests response
+            
+        Returns:
+            Raw HTML bytes, possibly truncated
+        """
+        html = bytearray()
+        for chunk in response.iter_content(chunk_size=16 * 1024):
+            # Re-scan a few bytes back in case a tag spans two chunks
+            scan_from = max(len(html) - 16, 0)
+            html += chunk
+            if len(html) >= MAX_HTML_BYTES:
+                return bytes(html[:MAX_HTML_BYTES])
+            if _HEAD_END.search(html, scan_from) and _TITLE_START.search(html):
+                break
+        return bytes(html)
 
 
 class CompetitorDiscoveryService:
@@ -237,6 +368,38 @@ class CompetitorDiscoveryService:
             'discovery_source': 'crunchbase'  # or 'similarweb', 'patents', etc.
         }
     
+    @staticmethod
+    def _competitor_values(
+        company_id: str,
+        name: str,
+        website_url: str,
+        discovery_rationale: str = None,
+        confidence_score: float = 0.0,
+        discovery_source: str = 'manual'
+    ) -> Dict[str, Any]:
+        """
+        Build column values for a new competitor from a validated URL.
+        
+        Args:
+            company_id: Company ID
+            name: Competitor name
+            website_url: Validated competitor website URL
+            discovery_rationale: Explanation of why this competitor was selected
+            confidence_score: Confidence score (0-100)
+            discovery_source: Source of discovery
+            
+        Returns:
+            Dictionary of Competitor column values
+        """
+        return {
+            'company_id': company_id,
+            'name': sanitize_input(name),
+            'website_url': website_url,
+            'discovery_rationale': discovery_rationale,
+            'confidence_score': confidence_score,
+            'discovery_source': discovery_source
+        }
+    
     @staticmethod
     def create_competitor(
         company_id: str,
@@ -263,24 +426,24 @@ class CompetitorDiscoveryService:
         try:
             website_url = validate_url(website_url, require_https=False)
             
-            # Check if competitor already exists
-            existing = Competitor.query.filter_by(
+            # Check if competitor already exists (id only, row loaded on a match)
+            existing_id = db.session.query(Competitor.id).filter_by(
                 company_id=company_id,
                 website_url=website_url
-            ).first()
+            ).limit(1).scalar()
             
-            if existing:
-                return existing, True, "Competitor already exists"
+            if existing_id:
+                return db.session.get(Competitor, existing_id), True, "Competitor already exists"
             
             # Create competitor
-            competitor = Competitor(
+            competitor = Competitor(**CompetitorDiscoveryService._competitor_values(
                 company_id=company_id,
-                name=sanitize_input(name),
+                name=name,
                 website_url=website_url,
                 discovery_rationale=discovery_rationale,
                 confidence_score=confidence_score,
                 discovery_source=discovery_source
-            )
+            ))
             
             db.session.add(competitor)
             db.session.commit()
@@ -296,6 +459,87 @@ class CompetitorDiscoveryService:
             logger.error(f"Error creating competitor: {str(e)}", exc_info=True)
             return None, False, f"Error creating competitor: {str(e)}"
     
+    @staticmethod
+    def create_competitors(
+        company_id: str,
+        candidates: List[Dict[str, Any]],
+        discovery_source: str = 'auto'
+    ) -> Tuple[List[Competitor], bool, str]:
+        """
+        Create several competitors for a company in one transaction.
+        
+        Candidates with an invalid URL are skipped. Candidates whose URL is
+        already tracked for the company return the existing competitor.
+        
+        Args:
+            company_id: Company ID
+            candidates: Dicts with name, website_url and optionally
+                discovery_rationale, confidence_score, discovery_source
+            discovery_source: Source used when a candidate does not give one
+            
+        Returns:
+            Tuple of (competitors in candidate order, success, message)
+        """
+        try:
+            valid = []
+            for candidate in candidates:
+                try:
+                    website_url = validate_url(candidate.get('website_url'), require_https=False)
+                except ValidationError as e:
+                    logger.warning(f"Skipping competitor candidate {candidate.get('name')}: {str(e)}")
+                    continue
+                valid.append((website_url, candidate))
+            
+            if not valid:
+                return [], True, "No valid competitors to create"
+            
+            # One lookup for every candidate URL already tracked
+            existing = {
+                competitor.website_url: competitor
+                for competitor in Competitor.query.filter(
+                    Competitor.company_id == company_id,
+                    Competitor.website_url.in_({url for url, _ in valid})
+                )
+            }
+            
+            # Column values for new URLs, deduplicated within the batch
+            rows = {}
+            for website_url, candidate in valid:
+                if website_url not in existing and website_url not in rows:
+                    rows[website_url] = CompetitorDiscoveryService._competitor_values(
+                        company_id=company_id,
+                        name=candidate.get('name'),
+                        website_url=website_url,
+                        discovery_rationale=candidate.get('discovery_rationale'),
+                        confidence_score=candidate.get('confidence_score', 0),
+                        discovery_source=candidate.get('discovery_source', discovery_source)
+                    )
+            
+            # One multi-row INSERT ... RETURNING instead of a unit-of-work flush
+            created = []
+            if rows:
+                created = db.session.scalars(
+                    insert(Competitor).returning(Competitor, sort_by_parameter_order=True),
+                    list(rows.values())
+                ).all()
+                existing.update(zip(rows, created))
+                ids = [competitor.id for competitor in existing.values()]
+                db.session.commit()
+                
+                # Refresh the rows expired by the commit with one SELECT
+                Competitor.query.filter(Competitor.id.in_(ids)).all()
+            
+            competitors = [existing[website_url] for website_url, _ in valid]
+            
+            logger.info(f"Created {len(created)} competitors for company {company_id}")
+            
+            return competitors, True, f"Created {len(created)} competitors"
+            
+        except Exception as e:
+            db.session.rollback()
+            logger.error(f"Error creating competitors: {str(e)}", exc_info=True)
+            return [], False, f"Error creating competitors: {str(e)}"
+    
     @staticmethod
     def approve_competitor(competitor_id: str) -> Tuple[bool, str]:
         """
@@ -308,13 +552,20 @@ class CompetitorDiscoveryService:
             Tuple of (success, message)
         """
         try:
-            competitor = Competitor.query.get(competitor_id)
-            if not competitor:
+            # Single UPDATE ... RETURNING instead of loading the row first
+            name = db.session.execute(
+                update(Competitor)
+                .where(Competitor.id == competitor_id)
+                .values(approved_by_user=True, approved_at=datetime.utcnow())
+                .returning(Competitor.name)
+            ).scalar()
+            if name is None:
+                db.session.rollback()
                 return False, "Competitor not found"
             
-            competitor.approve()
+            db.session.commit()
             
-            logger.info(f"Competitor approved: {competitor.name}")
+            logger.info(f"Competitor approved: {name}")
             
             return True, "Competitor approved successfully"
             
@@ -335,13 +586,19 @@ class CompetitorDiscoveryService:
             Tuple of (success, message)
         """
         try:
-            competitor = Competitor.query.get(competitor_id)
-            if not competitor:
+            name = db.session.execute(
+                update(Competitor)
+                .where(Competitor.id == competitor_id)
+                .values(approved_by_user=False)
+                .returning(Competitor.name)
+            ).scalar()
+            if name is None:
+                db.session.rollback()
                 return False, "Competitor not found"
             
-            competitor.reject()
+            db.session.commit()
             
-            logger.info(f"Competitor rejected: {competitor.name}")
+            logger.info(f"Competitor rejected: {name}")
             
             return True, "Competitor rejected successfully"
             
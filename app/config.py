@@ -26,13 +26,23 @@ class Config:
         DATABASE_URL = DATABASE_URL.replace('postgres://', 'postgresql://', 1)
     SQLALCHEMY_DATABASE_URI = DATABASE_URL
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+    # Missing tables are created on boot; one worker per deploy does it (Redis guard)
+    AUTO_CREATE_TABLES = os.environ.get('AUTO_CREATE_TABLES', 'true').lower() == 'true'
+    SCHEMA_INIT_GUARD_TTL = 300  # Seconds other workers skip create_all() after the first
     SQLALCHEMY_ENGINE_OPTIONS = {
         'pool_size': 10,
         'pool_recycle': 3600,
-        'pool_pre_ping': True,
+        # Costs a round trip per checkout; only disable where idle connections are never dropped
+        'pool_pre_ping': os.environ.get('DB_POOL_PRE_PING', 'true').lower() == 'true',
         'max_overflow': 20,
+        'query_cache_size': 1200,  # Compiled SQL cache entries per engine (default 500)
         'echo': False
     }
+    if SQLALCHEMY_DATABASE_URI.startswith('postgresql'):
+        # Server-side cap so a runaway query cannot hold a pooled connection
+        SQLALCHEMY_ENGINE_OPTIONS['connect_args'] = {
+            'options': f"-c statement_timeout={int(os.environ.get('DB_STATEMENT_TIMEOUT_MS', '30000'))}"
+        }
     
     # Redis
     REDIS_URL = os.environ.get('REDIS_URL', 'redis://localhost:6379/0')
@@ -49,6 +59,13 @@ class Config:
     CELERY_TASK_TRACK_STARTED = True
     CELERY_TASK_TIME_LIMIT = 30 * 60  # 30 minutes
     CELERY_TASK_SOFT_TIME_LIMIT = 25 * 60  # 25 minutes
+    CELERY_BROKER_POOL_LIMIT = int(os.environ.get('CELERY_BROKER_POOL_LIMIT', '50'))  # Shared by web threads enqueuing tasks
+    CELERY_BROKER_TRANSPORT_OPTIONS = {
+        'socket_keepalive': True,
+        'socket_timeout': 5,
+        'retry_on_timeout': True
+    }
+    CELERY_WORKER_PREFETCH_MULTIPLIER = 1  # Report tasks run for minutes; don't queue them behind a busy worker
     
     # JWT
     JWT_SECRET_KEY = os.environ.get('JWT_SECRET_KEY') or SECRET_KEY
@@ -58,6 +75,8 @@ class Config:
     JWT_COOKIE_SECURE = True
     JWT_COOKIE_HTTPONLY = True
     JWT_COOKIE_SAMESITE = 'Lax'
+    JWT_DECODE_CACHE_TTL = int(os.environ.get('JWT_DECODE_CACHE_TTL', '5'))  # Seconds; 0 disables
+    JWT_DECODE_CACHE_SIZE = 10000
     
     # Flask-Login
     SESSION_COOKIE_SECURE = True
@@ -68,7 +87,13 @@ class Config:
     REMEMBER_COOKIE_DURATION = timedelta(days=30)
     
     # Security
-    BCRYPT_LOG_ROUNDS = 12
+    PASSWORD_HASHER = os.environ.get('PASSWORD_HASHER', 'bcrypt')  # 'bcrypt', 'argon2id' or 'werkzeug'
+    BCRYPT_LOG_ROUNDS = int(os.environ.get('BCRYPT_LOG_ROUNDS', '12'))
+    ARGON2_MEMORY_COST = int(os.environ.get('ARGON2_MEMORY_COST', str(46 * 1024)))  # KiB (OWASP: 46 MiB, t=1, p=1)
+    ARGON2_TIME_COST = int(os.environ.get('ARGON2_TIME_COST', '1'))
+    ARGON2_PARALLELISM = int(os.environ.get('ARGON2_PARALLELISM', '1'))
+    PASSWORD_HASH_METHOD = os.environ.get('PASSWORD_HASH_METHOD', 'scrypt')  # werkzeug method string
+    PASSWORD_SALT_LENGTH = 16
     CSRF_ENABLED = True
     CSRF_TIME_LIMIT = 3600
     MAX_LOGIN_ATTEMPTS = 5
@@ -76,7 +101,9 @@ class Config:
     
     # Rate Limiting
     RATELIMIT_ENABLED = True
-    RATELIMIT_STORAGE_URL = REDIS_URL
+    # Hits are counted in process and flushed to Redis in batches
+    RATELIMIT_STORAGE_URI = os.environ.get('RATELIMIT_STORAGE_URI', f'batched+{REDIS_URL}')
+    RATELIMIT_STORAGE_OPTIONS = {'flush_interval': 0.02}
     RATELIMIT_DEFAULT = "200 per hour"
     RATELIMIT_STRATEGY = "fixed-window"
     
@@ -156,6 +183,7 @@ class DevelopmentConfig(Config):
     SESSION_COOKIE_SECURE = False
     REMEMBER_COOKIE_SECURE = False
     CSRF_ENABLED = True  # Still enforce CSRF even in dev
+    AUTO_CREATE_TABLES = True
 
 
 class StagingConfig(Config):
@@ -182,13 +210,19 @@ class TestingConfig(Config):
     TESTING = True
     DEBUG = True
     SQLALCHEMY_DATABASE_URI = 'sqlite:///:memory:'
+    SQLALCHEMY_ENGINE_OPTIONS = {}  # Pool and PostgreSQL options do not apply to in-memory SQLite
+    AUTO_CREATE_TABLES = True
     REDIS_URL = 'redis://localhost:6379/15'  # Separate DB for tests
     CELERY_BROKER_URL = 'redis://localhost:6379/15'
     CELERY_RESULT_BACKEND = 'redis://localhost:6379/15'
+    RATELIMIT_STORAGE_URI = 'memory://'
+    RATELIMIT_STORAGE_OPTIONS = {}
     JWT_COOKIE_SECURE = False
     SESSION_COOKIE_SECURE = False
     CSRF_ENABLED = False
     WTF_CSRF_ENABLED = False
+    PASSWORD_HASHER = 'werkzeug'
+    PASSWORD_HASH_METHOD = 'pbkdf2:sha256:1000'  # Fast hashing for test runs only
 
 
 # Configuration mapping
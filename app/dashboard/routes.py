@@ -6,6 +6,7 @@ from app.auth.decorators import requires_authentication
 from app.companies.models import Company
 from app.reports.models import Report
 from app.extensions import db
+from sqlalchemy.orm import defer
 import logging
 
 
@@ -44,7 +45,16 @@ def dashboard_data():
         user_id = get_jwt_identity()
         
         companies = Company.query.filter_by(user_id=user_id).all()
-        reports = Report.query.filter_by(user_id=user_id).order_by(Report.generated_at.desc()).limit(10).all()
+        
+        # The summary dict never reads the JSON report bodies, so don't fetch them
+        reports = Report.query.options(
+            defer(Report.executive_summary),
+            defer(Report.threat_scores),
+            defer(Report.opportunities),
+            defer(Report.recommendations),
+            defer(Report.data_sources),
+            defer(Report.delivery_error)
+        ).filter_by(user_id=user_id).order_by(Report.generated_at.desc()).limit(10).all()
         
         return jsonify({
             'companies': [c.to_dict() for c in companies],
@@ -70,17 +70,17 @@ class EmailService:
             
             # Attach report if provided
             if report_path and report_path.exists():
+                # Encode straight from the read so the raw bytes are freed before decoding
                 with open(report_path, 'rb') as f:
-                    data = f.read()
-                    encoded = base64.b64encode(data).decode()
-                    
-                    attachment = Attachment(
-                        FileContent(encoded),
-                        FileName(report_path.name),
-                        FileType('application/pdf'),
-                        Disposition('attachment')
-                    )
-                    message.add_attachment(attachment)
+                    encoded = base64.b64encode(f.read()).decode('ascii')
+                
+                attachment = Attachment(
+                    FileContent(encoded),
+                    FileName(report_path.name),
+                    FileType('application/pdf'),
+                    Disposition('attachment')
+                )
+                message.add_attachment(attachment)
             
             # Send email
             response = self.client.send(message)
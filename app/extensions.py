@@ -8,11 +8,12 @@ Extensions are initialized in app/__init__.py after app creation.
 from flask_sqlalchemy import SQLAlchemy
 from flask_redis import FlaskRedis
 from celery import Celery
-from flask_jwt_extended import JWTManager
 from flask_login import LoginManager
 from flask_wtf.csrf import CSRFProtect
 from flask_limiter import Limiter
-from flask_limiter.util import get_remote_address
+from app.auth.jwt_cache import CachingJWTManager
+from app.utils.limiter_storage import BatchedRedisStorage  # noqa: F401  (registers batched+redis://)
+from app.utils.rate_limiting import get_rate_limit_key
 
 
 # Database
@@ -24,8 +25,8 @@ redis_client = FlaskRedis(decode_responses=True)
 # Celery (for background tasks)
 celery = Celery(__name__)
 
-# JWT Manager
-jwt = JWTManager()
+# JWT Manager (caches verified claims briefly per token)
+jwt = CachingJWTManager()
 
 # Flask-Login
 login_manager = LoginManager()
@@ -39,7 +40,7 @@ csrf = CSRFProtect()
 
 # Rate Limiter
 limiter = Limiter(
-    key_func=get_remote_address,
+    key_func=get_rate_limit_key,
     default_limits=["200 per hour"],
-    storage_uri=None  # Will be set in app initialization
+    storage_uri=None  # Set from RATELIMIT_STORAGE_URI in app config
 )
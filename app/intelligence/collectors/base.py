@@ -3,7 +3,7 @@ Base collector class for intelligence data collection.
 
 All collectors inherit from this base class which provides:
 - Rate limiting enforcement
-- Error handling and retries (exponential backoff)
+- Error handling and retries (exponential backoff with jitter)
 - Data validation
 - Caching logic (Redis with TTL)
 - Confidence scoring
@@ -14,6 +14,7 @@ from typing import Dict, Any, Optional, Tuple
 from app.extensions import redis_client
 from app.utils.caching import CacheManager
 from app.utils.rate_limiting import RateLimiter
+import random
 import time
 import logging
 from datetime import datetime, timedelta
@@ -91,16 +92,22 @@ class BaseCollector(ABC):
         func,
         max_retries: int = 3,
         initial_delay: float = 1.0,
-        backoff_factor: float = 2.0
+        backoff_factor: float = 2.0,
+        max_delay: float = 30.0
     ) -> Tuple[Optional[Any], bool]:
         """
         Execute function with exponential backoff retry logic.
         
+        Delays use decorrelated jitter: each one is drawn between initial_delay
+        and backoff_factor times the previous delay, so collectors that fail
+        together (e.g. on a 429) do not retry in lockstep.
+        
         Args:
             func: Function to execute
             max_retries: Maximum number of retries
             initial_delay: Initial delay in seconds
             backoff_factor: Backoff multiplier
+            max_delay: Upper bound for a single delay in seconds
             
         Returns:
             Tuple of (result, success)
@@ -116,9 +123,9 @@ class BaseCollector(ABC):
                     logger.error(f"Max retries exceeded for {self.name}: {str(e)}")
                     return None, False
                 
-                logger.warning(f"Attempt {attempt + 1} failed for {self.name}: {str(e)}. Retrying in {delay}s...")
+                delay = min(max_delay, random.uniform(initial_delay, delay * backoff_factor))
+                logger.warning(f"Attempt {attempt + 1} failed for {self.name}: {str(e)}. Retrying in {delay:.2f}s...")
                 time.sleep(delay)
-                delay *= backoff_factor
         
         return None, False
     
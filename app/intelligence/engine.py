@@ -162,9 +162,9 @@ class IntelligenceEngine:
                     existing.set_raw_data(data_info.get('data', {}))
                     existing.confidence_score = data_info.get('confidence_score', 0)
                     # Get collector for TTL
-                collector_instance = self.collectors.get(data_type_str)
-                ttl = collector_instance.cache_ttl if collector_instance else 3600
-                existing.set_expiration(ttl)  # Set expiration based on collector TTL
+                    collector_instance = self.collectors.get(data_type_str)
+                    ttl = collector_instance.cache_ttl if collector_instance else 3600
+                    existing.set_expiration(ttl)  # Set expiration based on collector TTL
                     existing.increment_version()
                     record = existing
                 else:
@@ -6,10 +6,11 @@ intelligence and analyzed insights.
 """
 
 from app.extensions import db
+from app.utils.json_provider import dumps_text
 from datetime import datetime, timedelta
 import uuid
 import enum
-import json
+import orjson
 from typing import Dict, Any, List, Optional
 
 
@@ -74,8 +75,8 @@ class IntelligenceData(db.Model):
         if not self.raw_data:
             return None
         try:
-            return json.loads(self.raw_data)
-        except (json.JSONDecodeError, TypeError):
+            return orjson.loads(self.raw_data)
+        except (orjson.JSONDecodeError, TypeError):
             return None
     
     def set_raw_data(self, data: Dict[str, Any]):
@@ -85,7 +86,7 @@ class IntelligenceData(db.Model):
         Args:
             data: Dictionary of raw data
         """
-        self.raw_data = json.dumps(data, default=str) if data else None
+        self.raw_data = dumps_text(data, default=str) if data else None
     
     def get_analyzed_data(self) -> Optional[Dict[str, Any]]:
         """
@@ -97,8 +98,8 @@ class IntelligenceData(db.Model):
         if not self.analyzed_data:
             return None
         try:
-            return json.loads(self.analyzed_data)
-        except (json.JSONDecodeError, TypeError):
+            return orjson.loads(self.analyzed_data)
+        except (orjson.JSONDecodeError, TypeError):
             return None
     
     def set_analyzed_data(self, data: Dict[str, Any]):
@@ -108,7 +109,7 @@ class IntelligenceData(db.Model):
         Args:
             data: Dictionary of analyzed data
         """
-        self.analyzed_data = json.dumps(data, default=str) if data else None
+        self.analyzed_data = dumps_text(data, default=str) if data else None
     
     def is_expired(self) -> bool:
         """
@@ -153,11 +154,11 @@ class IntelligenceData(db.Model):
             'source': self.source,
             'confidence_score': self.confidence_score,
             'version': self.version,
-            'collected_at': self.collected_at.isoformat() if self.collected_at else None,
-            'expires_at': self.expires_at.isoformat() if self.expires_at else None,
+            'collected_at': self.collected_at,
+            'expires_at': self.expires_at,
             'is_expired': self.is_expired(),
-            'created_at': self.created_at.isoformat() if self.created_at else None,
-            'updated_at': self.updated_at.isoformat() if self.updated_at else None
+            'created_at': self.created_at,
+            'updated_at': self.updated_at
         }
         
         if include_raw:
@@ -222,8 +223,8 @@ class Startup(db.Model):
         if not self.funding_stages:
             return []
         try:
-            return json.loads(self.funding_stages)
-        except (json.JSONDecodeError, TypeError):
+            return orjson.loads(self.funding_stages)
+        except (orjson.JSONDecodeError, TypeError):
             return []
     
     def set_funding_stages(self, stages: List[Dict[str, Any]]):
@@ -233,7 +234,7 @@ class Startup(db.Model):
         Args:
             stages: List of funding stage dictionaries
         """
-        self.funding_stages = json.dumps(stages, default=str) if stages else None
+        self.funding_stages = dumps_text(stages, default=str) if stages else None
     
     def get_key_hires(self) -> List[Dict[str, Any]]:
         """
@@ -245,8 +246,8 @@ class Startup(db.Model):
         if not self.key_hires:
             return []
         try:
-            return json.loads(self.key_hires)
-        except (json.JSONDecodeError, TypeError):
+            return orjson.loads(self.key_hires)
+        except (orjson.JSONDecodeError, TypeError):
             return []
     
     def set_key_hires(self, hires: List[Dict[str, Any]]):
@@ -256,7 +257,7 @@ class Startup(db.Model):
         Args:
             hires: List of key hire dictionaries
         """
-        self.key_hires = json.dumps(hires, default=str) if hires else None
+        self.key_hires = dumps_text(hires, default=str) if hires else None
     
     def get_innovation_signals(self) -> Dict[str, Any]:
         """
@@ -268,8 +269,8 @@ class Startup(db.Model):
         if not self.innovation_signals:
             return {}
         try:
-            return json.loads(self.innovation_signals)
-        except (json.JSONDecodeError, TypeError):
+            return orjson.loads(self.innovation_signals)
+        except (orjson.JSONDecodeError, TypeError):
             return {}
     
     def set_innovation_signals(self, signals: Dict[str, Any]):
@@ -279,7 +280,7 @@ class Startup(db.Model):
         Args:
             signals: Dictionary of innovation signals
         """
-        self.innovation_signals = json.dumps(signals, default=str) if signals else None
+        self.innovation_signals = dumps_text(signals, default=str) if signals else None
     
     def get_swot_analysis(self) -> Dict[str, Any]:
         """
@@ -296,8 +297,8 @@ class Startup(db.Model):
                 'threats': []
             }
         try:
-            return json.loads(self.swot_analysis)
-        except (json.JSONDecodeError, TypeError):
+            return orjson.loads(self.swot_analysis)
+        except (orjson.JSONDecodeError, TypeError):
             return {
                 'strengths': [],
                 'weaknesses': [],
@@ -312,7 +313,7 @@ class Startup(db.Model):
         Args:
             swot: Dictionary with SWOT components
         """
-        self.swot_analysis = json.dumps(swot, default=str) if swot else None
+        self.swot_analysis = dumps_text(swot, default=str) if swot else None
     
     def to_dict(self) -> dict:
         """
@@ -330,7 +331,7 @@ class Startup(db.Model):
             'description': self.description,
             'funding_total': float(self.funding_total) if self.funding_total else None,
             'funding_stages': self.get_funding_stages(),
-            'latest_funding_date': self.latest_funding_date.isoformat() if self.latest_funding_date else None,
+            'latest_funding_date': self.latest_funding_date,
             'latest_funding_round': self.latest_funding_round,
             'key_hires': self.get_key_hires(),
             'employee_count': self.employee_count,
@@ -338,8 +339,8 @@ class Startup(db.Model):
             'swot_analysis': self.get_swot_analysis(),
             'relevance_score': self.relevance_score,
             'strategic_role': self.strategic_role,
-            'discovered_at': self.discovered_at.isoformat() if self.discovered_at else None,
-            'updated_at': self.updated_at.isoformat() if self.updated_at else None
+            'discovered_at': self.discovered_at,
+            'updated_at': self.updated_at
         }
     
     def __repr__(self):
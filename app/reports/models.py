@@ -5,10 +5,11 @@ Implements Report model for storing generated intelligence reports.
 """
 
 from app.extensions import db
+from app.utils.json_provider import dumps_text
 from datetime import datetime
 import uuid
 import enum
-import json
+import orjson
 from typing import Dict, Any, List, Optional
 from decimal import Decimal
 
@@ -81,8 +82,8 @@ class Report(db.Model):
         if not self.executive_summary:
             return None
         try:
-            return json.loads(self.executive_summary)
-        except (json.JSONDecodeError, TypeError):
+            return orjson.loads(self.executive_summary)
+        except (orjson.JSONDecodeError, TypeError):
             return None
     
     def set_executive_summary(self, summary: Dict[str, Any]):
@@ -92,7 +93,7 @@ class Report(db.Model):
         Args:
             summary: Dictionary with executive summary data
         """
-        self.executive_summary = json.dumps(summary, default=str) if summary else None
+        self.executive_summary = dumps_text(summary, default=str) if summary else None
     
     def get_threat_scores(self) -> Optional[Dict[str, float]]:
         """
@@ -104,8 +105,8 @@ class Report(db.Model):
         if not self.threat_scores:
             return None
         try:
-            return json.loads(self.threat_scores)
-        except (json.JSONDecodeError, TypeError):
+            return orjson.loads(self.threat_scores)
+        except (orjson.JSONDecodeError, TypeError):
             return None
     
     def set_threat_scores(self, scores: Dict[str, float]):
@@ -115,7 +116,7 @@ class Report(db.Model):
         Args:
             scores: Dictionary mapping competitor IDs to threat scores
         """
-        self.threat_scores = json.dumps(scores, default=str) if scores else None
+        self.threat_scores = dumps_text(scores, default=str) if scores else None
     
     def get_opportunities(self) -> List[Dict[str, Any]]:
         """
@@ -127,8 +128,8 @@ class Report(db.Model):
         if not self.opportunities:
             return []
         try:
-            return json.loads(self.opportunities)
-        except (json.JSONDecodeError, TypeError):
+            return orjson.loads(self.opportunities)
+        except (orjson.JSONDecodeError, TypeError):
             return []
     
     def set_opportunities(self, opportunities: List[Dict[str, Any]]):
@@ -138,7 +139,7 @@ class Report(db.Model):
         Args:
             opportunities: List of opportunity dictionaries
         """
-        self.opportunities = json.dumps(opportunities, default=str) if opportunities else None
+        self.opportunities = dumps_text(opportunities, default=str) if opportunities else None
     
     def get_recommendations(self) -> List[Dict[str, Any]]:
         """
@@ -150,8 +151,8 @@ class Report(db.Model):
         if not self.recommendations:
             return []
         try:
-            return json.loads(self.recommendations)
-        except (json.JSONDecodeError, TypeError):
+            return orjson.loads(self.recommendations)
+        except (orjson.JSONDecodeError, TypeError):
             return []
     
     def set_recommendations(self, recommendations: List[Dict[str, Any]]):
@@ -161,7 +162,7 @@ class Report(db.Model):
         Args:
             recommendations: List of recommendation dictionaries
         """
-        self.recommendations = json.dumps(recommendations, default=str) if recommendations else None
+        self.recommendations = dumps_text(recommendations, default=str) if recommendations else None
     
     def get_data_sources(self) -> List[str]:
         """
@@ -173,8 +174,8 @@ class Report(db.Model):
         if not self.data_sources:
             return []
         try:
-            return json.loads(self.data_sources)
-        except (json.JSONDecodeError, TypeError):
+            return orjson.loads(self.data_sources)
+        except (orjson.JSONDecodeError, TypeError):
             return []
     
     def set_data_sources(self, sources: List[str]):
@@ -184,7 +185,7 @@ class Report(db.Model):
         Args:
             sources: List of data source strings
         """
-        self.data_sources = json.dumps(sources) if sources else None
+        self.data_sources = dumps_text(sources) if sources else None
     
     def mark_delivered(self):
         """Mark report as delivered."""
@@ -218,17 +219,17 @@ class Report(db.Model):
             'company_id': self.company_id,
             'user_id': self.user_id,
             'report_type': self.report_type.value if self.report_type else None,
-            'period_start': self.period_start.isoformat() if self.period_start else None,
-            'period_end': self.period_end.isoformat() if self.period_end else None,
+            'period_start': self.period_start,
+            'period_end': self.period_end,
             'file_size': self.file_size,
             'checksum': self.checksum,
             'overall_confidence': self.overall_confidence,
             'methodology_notes': self.methodology_notes,
-            'generated_at': self.generated_at.isoformat() if self.generated_at else None,
-            'delivered_at': self.delivered_at.isoformat() if self.delivered_at else None,
+            'generated_at': self.generated_at,
+            'delivered_at': self.delivered_at,
             'delivery_status': self.delivery_status,
-            'created_at': self.created_at.isoformat() if self.created_at else None,
-            'updated_at': self.updated_at.isoformat() if self.updated_at else None
+            'created_at': self.created_at,
+            'updated_at': self.updated_at
         }
         
         if include_full:
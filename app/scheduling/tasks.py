@@ -7,6 +7,7 @@ from app.companies.models import Company, TrackingConfig, ReportFrequency
 from app.intelligence.engine import IntelligenceEngine
 from app.email.service import EmailService
 from app.config import Config
+from sqlalchemy.orm import joinedload, selectinload
 from pathlib import Path
 from datetime import datetime, timedelta
 import logging
@@ -32,8 +33,11 @@ def generate_quarterly_report(company_id: str, user_id: str):
     try:
         logger.info(f"Starting quarterly report generation for company: {company_id}")
         
-        # Get company and tracking config
-        company = Company.query.get(company_id)
+        # Get company with tracking config and competitors in two queries
+        company = Company.query.options(
+            joinedload(Company.tracking_config),
+            selectinload(Company.competitors)
+        ).get(company_id)
         if not company:
             logger.error(f"Company not found: {company_id}")
             return False
@@ -0,0 +1,53 @@
+"""
+CORS header handling for Flask application.
+
+Adds Cross-Origin Resource Sharing headers from a single after_request hook.
+Allowed origins, methods and headers are resolved once when the hook is
+registered.
+"""
+
+from flask import request
+from typing import Iterable
+
+
+def init_cors(app, origins: Iterable[str], methods: Iterable[str], allow_headers: Iterable[str],
+              supports_credentials: bool = True):
+    """
+    Register CORS response headers for Flask application.
+
+    Args:
+        app: Flask application instance
+        origins: Allowed request origins
+        methods: Methods advertised on preflight responses
+        allow_headers: Request headers accepted on preflight responses
+        supports_credentials: If True, allows cookies and Authorization headers
+    """
+    allowed_origins = frozenset(origin.strip() for origin in origins if origin.strip())
+    allowed_headers = frozenset(header.lower() for header in allow_headers)
+    allow_methods = ', '.join(methods)
+
+    @app.after_request
+    def add_cors_headers(response):
+        """Add CORS headers for requests from allowed origins."""
+        origin = request.headers.get('Origin')
+        if not origin or origin not in allowed_origins:
+            return response
+
+        headers = response.headers
+        headers['Access-Control-Allow-Origin'] = origin
+        headers.add('Vary', 'Origin')
+        if supports_credentials:
+            headers['Access-Control-Allow-Credentials'] = 'true'
+
+        # Preflight request
+        if request.method == 'OPTIONS' and 'Access-Control-Request-Method' in request.headers:
+            headers['Access-Control-Allow-Methods'] = allow_methods
+            requested = request.headers.get('Access-Control-Request-Headers', '')
+            granted = [
+                header.strip() for header in requested.split(',')
+                if header.strip().lower() in allowed_headers
+            ]
+            if granted:
+                headers['Access-Control-Allow-Headers'] = ', '.join(granted)
+
+        return response
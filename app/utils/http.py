@@ -0,0 +1,53 @@
+"""
+HTTP client utilities for Radar application.
+
+Provides pooled requests sessions so outbound calls to the same hosts reuse
+keep-alive connections instead of opening a new TCP/TLS connection per call.
+"""
+
+from requests import Session
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from typing import Iterable, Optional
+
+
+def create_session(
+    pool_connections: int = 10,
+    pool_maxsize: int = 10,
+    retries: int = 0,
+    backoff_factor: float = 0.2,
+    status_forcelist: Iterable[int] = (502, 503, 504),
+    allowed_methods: Iterable[str] = ('GET',),
+    headers: Optional[dict] = None
+) -> Session:
+    """
+    Create a requests session with a pooled HTTPS adapter.
+
+    Args:
+        pool_connections: Number of per-host connection pools to cache
+        pool_maxsize: Maximum connections kept per host
+        retries: Retry budget for connection errors and retryable statuses
+        backoff_factor: Exponential backoff factor between retries
+        status_forcelist: Response statuses that trigger a retry
+        allowed_methods: Methods that may be retried (keep non-idempotent calls out)
+        headers: Default headers sent with every request
+
+    Returns:
+        Configured requests Session (thread-safe for concurrent requests)
+    """
+    retry = Retry(
+        total=retries,
+        backoff_factor=backoff_factor,
+        status_forcelist=tuple(status_forcelist),
+        allowed_methods=frozenset(allowed_methods),
+        raise_on_status=False
+    )
+    adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize, max_retries=retry)
+
+    session = Session()
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    if headers:
+        session.headers.update(headers)
+
+    return session
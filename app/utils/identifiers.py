@@ -0,0 +1,41 @@
+"""
+Identifier generation utilities for Radar application.
+
+Provides time-ordered UUIDs (UUIDv7, RFC 9562) for primary keys so that new
+rows land at the right edge of the primary key index instead of at random
+positions.
+"""
+
+import os
+import time
+import uuid
+
+
+def uuid7() -> uuid.UUID:
+    """
+    Generate a UUIDv7.
+
+    Layout: 48-bit Unix timestamp in milliseconds, 4-bit version,
+    12 random bits, 2-bit variant, 62 random bits.
+
+    Returns:
+        Time-ordered UUID
+    """
+    timestamp_ms = time.time_ns() // 1_000_000
+    value = ((timestamp_ms & 0xFFFF_FFFF_FFFF) << 80) | int.from_bytes(os.urandom(10), 'big')
+
+    # Set version (7) and RFC 4122 variant bits
+    value = (value & ~(0xF << 76)) | (0x7 << 76)
+    value = (value & ~(0x3 << 62)) | (0x2 << 62)
+
+    return uuid.UUID(int=value)
+
+
+def generate_uuid7() -> str:
+    """
+    Generate a UUIDv7 as a 36-character string (column default helper).
+
+    Returns:
+        Canonical UUID string
+    """
+    return str(uuid7())
@@ -0,0 +1,96 @@
+"""
+orjson-backed JSON provider for Flask application.
+
+Request bodies (request.get_json) and jsonify responses are parsed and
+serialized by orjson. Output matches Flask's default provider (sorted keys,
+indented responses in debug mode), except that datetimes and dates are
+written as ISO 8601 strings by orjson, so models can return them as is.
+
+Also provides dumps_text for models that store JSON in text columns.
+"""
+
+from flask.json.provider import DefaultJSONProvider
+from typing import Any, Callable, Optional
+import orjson
+
+
+def dumps_text(obj: Any, default: Optional[Callable[[Any], Any]] = None) -> str:
+    """
+    Serialize data to a JSON string with orjson.
+
+    Datetimes and non-string dict keys are handled like json.dumps: datetimes
+    go through default, keys are converted to strings.
+
+    Args:
+        obj: Data to serialize
+        default: Called for objects orjson cannot serialize (e.g. str)
+
+    Returns:
+        Compact JSON string
+    """
+    return orjson.dumps(obj, default=default, option=orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS).decode()
+
+
+class ORJSONProvider(DefaultJSONProvider):
+    """
+    Flask JSON provider using orjson.
+
+    Types orjson cannot serialize natively go through
+    DefaultJSONProvider.default.
+    """
+
+    # Keyword arguments the orjson path understands; anything else falls back to json
+    _ORJSON_KWARGS = frozenset(['indent', 'separators'])
+
+    def _dumps(self, obj: Any, indent: Optional[int] = None) -> bytes:
+        option = orjson.OPT_NON_STR_KEYS
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, default=self.default, option=option)
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        """
+        Serialize data as JSON to a string.
+
+        Args:
+            obj: Data to serialize
+            **kwargs: json.dumps arguments; only indent and separators use orjson
+
+        Returns:
+            JSON string
+        """
+        if not kwargs.keys() <= self._ORJSON_KWARGS:
+            return super().dumps(obj, **kwargs)
+        return self._dumps(obj, kwargs.get('indent')).decode()
+
+    def loads(self, s: Any, **kwargs: Any) -> Any:
+        """
+        Deserialize JSON from a string or UTF-8 bytes.
+
+        Args:
+            s: JSON document
+            **kwargs: json.loads arguments; any given falls back to json
+
+        Returns:
+            Deserialized data
+        """
+        if kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+
+    def response(self, *args: Any, **kwargs: Any):
+        """
+        Serialize arguments as JSON and wrap them in a response.
+
+        Args:
+            *args: A single value, or multiple values serialized as a list
+            **kwargs: Serialized as a dict
+
+        Returns:
+            Flask Response with application/json mimetype
+        """
+        obj = self._prepare_response_obj(args, kwargs)
+        indent = 2 if (self.compact is None and self._app.debug) or self.compact is False else None
+        return self._app.response_class(self._dumps(obj, indent) + b'\n', mimetype=self.mimetype)
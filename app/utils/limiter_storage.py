@@ -0,0 +1,218 @@
+"""
+Batched Redis storage backend for Flask-Limiter.
+
+Rate limit hits on busy keys are counted in process and flushed to Redis in
+one pipelined round trip every few milliseconds by a background thread, so
+those requests do not wait on Redis. Each flush returns the global count,
+which is folded back into the local counters. Keys whose local count has
+not been synced recently are incremented in Redis directly.
+
+Registered with the `limits` storage registry under the
+``batched+redis://`` and ``batched+rediss://`` schemes.
+"""
+
+from limits.storage import Storage
+from typing import Dict, List, Tuple
+import logging
+import os
+import threading
+import time
+
+import redis
+
+
+logger = logging.getLogger(__name__)
+
+# Add a flushed delta to a window counter, starting its expiry with the window.
+# Returns {count, ttl_milliseconds}.
+BATCHED_INCR_SCRIPT = """
+local count = redis.call('INCRBY', KEYS[1], ARGV[1])
+if count == tonumber(ARGV[1]) then
+    redis.call('EXPIRE', KEYS[1], ARGV[2])
+end
+return {count, redis.call('PTTL', KEYS[1])}
+"""
+
+
+class BatchedRedisStorage(Storage):
+    """
+    Fixed-window counter storage with in-process counting and batched flushes.
+
+    While a key's global count was synced within max_staleness seconds,
+    hits are admitted against that count plus the hits seen locally since.
+    A limit can therefore be exceeded by at most the hits other workers
+    admit within that window. Cold or stale keys take one synchronous
+    round trip, which also re-syncs them.
+
+    Options (RATELIMIT_STORAGE_OPTIONS):
+        flush_interval: Seconds between flushes (default 0.02)
+        max_staleness: Seconds a synced count is trusted locally (default 0.1)
+        key_prefix: Prefix for counter keys in Redis (default 'LIMITS')
+    """
+
+    STORAGE_SCHEME = ['batched+redis', 'batched+rediss']
+
+    def __init__(self, uri: str, wrap_exceptions: bool = False, flush_interval: float = 0.02,
+                 max_staleness: float = 0.1, key_prefix: str = 'LIMITS', **options):
+        super().__init__(uri, wrap_exceptions=wrap_exceptions, **options)
+        self.redis = redis.from_url(uri.split('+', 1)[1], **options)
+        self.flush_interval = float(flush_interval)
+        self.max_staleness = float(max_staleness)
+        self.key_prefix = key_prefix
+        self._flush_script = self.redis.register_script(BATCHED_INCR_SCRIPT)
+
+        # key -> [count, unflushed hits, window expiry timestamp, last sync timestamp]
+        self._counters: Dict[str, List[float]] = {}
+        # key -> window length for keys with unflushed hits
+        self._dirty: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._flusher = None
+        self._flusher_pid = None
+
+    @property
+    def base_exceptions(self):
+        return redis.RedisError
+
+    def _redis_key(self, key: str) -> str:
+        return f"{self.key_prefix}:{key}"
+
+    def _ensure_flusher(self):
+        """Start the flush thread, restarting it in forked workers."""
+        pid = os.getpid()
+        if self._flusher_pid == pid:
+            return
+        with self._lock:
+            if self._flusher_pid == pid:
+                return
+            # Counters inherited from a parent process belong to its flusher
+            self._counters.clear()
+            self._dirty.clear()
+            self._flusher = threading.Thread(target=self._run_flusher, name='limiter-flush', daemon=True)
+            self._flusher.start()
+            self._flusher_pid = pid
+
+    def _run_flusher(self):
+        while True:
+            time.sleep(self.flush_interval)
+            try:
+                self.flush()
+            except Exception as e:
+                logger.warning(f"Rate limit flush failed: {str(e)}")
+
+    def flush(self):
+        """Push unflushed hits to Redis and refresh the local counts."""
+        with self._lock:
+            if not self._dirty:
+                return
+            batch: List[Tuple[str, int, int]] = []
+            for key, expiry in self._dirty.items():
+                state = self._counters.get(key)
+                if state and state[1]:
+                    batch.append((key, int(state[1]), expiry))
+                    state[1] = 0
+            self._dirty.clear()
+
+        if not batch:
+            return
+
+        try:
+            pipe = self.redis.pipeline(transaction=False)
+            for key, delta, expiry in batch:
+                self._flush_script(keys=[self._redis_key(key)], args=[delta, expiry], client=pipe)
+            results = pipe.execute()
+        except redis.RedisError:
+            # Keep the hits so the next flush retries them
+            with self._lock:
+                for key, delta, expiry in batch:
+                    state = self._counters.get(key)
+                    if state:
+                        state[1] += delta
+                        self._dirty[key] = expiry
+            raise
+
+        now = time.time()
+        with self._lock:
+            for (key, delta, expiry), (count, ttl_ms) in zip(batch, results):
+                state = self._counters.get(key)
+                if state is None:
+                    continue
+                self._sync(state, count, ttl_ms, now)
+
+            # Drop finished windows that have nothing left to flush
+            expired = [key for key, state in self._counters.items() if state[2] <= now and not state[1]]
+            for key in expired:
+                del self._counters[key]
+
+    @staticmethod
+    def _sync(state: List[float], count: int, ttl_ms: int, now: float):
+        """Fold a global count from Redis into a local counter (lock held)."""
+        # Global count plus hits admitted here since it was read
+        state[0] = count + state[1]
+        if ttl_ms > 0:
+            state[2] = now + ttl_ms / 1000.0
+        state[3] = now
+
+    def incr(self, key: str, expiry: int, amount: int = 1) -> int:
+        self._ensure_flusher()
+        now = time.time()
+        with self._lock:
+            state = self._fresh_state(key, now)
+            if state is not None:
+                state[0] += amount
+                state[1] += amount
+                self._dirty[key] = expiry
+                return int(state[0])
+
+        # Cold, expired or stale key: count this hit in Redis directly
+        count, ttl_ms = self._flush_script(keys=[self._redis_key(key)], args=[amount, expiry])
+        now = time.time()
+        with self._lock:
+            state = self._counters.get(key)
+            if state is None or state[2] <= now:
+                state = self._counters[key] = [0, 0, now + expiry, now]
+            self._sync(state, count, ttl_ms, now)
+            return int(state[0])
+
+    def _fresh_state(self, key: str, now: float):
+        """Return the local counter for key if it can be trusted (lock held)."""
+        state = self._counters.get(key)
+        if state is not None and state[2] > now and now - state[3] <= self.max_staleness:
+            return state
+        return None
+
+    def get(self, key: str) -> int:
+        now = time.time()
+        with self._lock:
+            state = self._fresh_state(key, now)
+            if state is not None:
+                return int(state[0])
+            state = self._counters.get(key)
+            pending = state[1] if state is not None and state[2] > now else 0
+        return int(self.redis.get(self._redis_key(key)) or 0) + int(pending)
+
+    def get_expiry(self, key: str) -> float:
+        now = time.time()
+        with self._lock:
+            state = self._fresh_state(key, now)
+            if state is not None:
+                return state[2]
+        return now + max(self.redis.pttl(self._redis_key(key)), 0) / 1000.0
+
+    def check(self) -> bool:
+        try:
+            return self.redis.ping()
+        except redis.RedisError:
+            return False
+
+    def reset(self) -> int:
+        with self._lock:
+            self._counters.clear()
+            self._dirty.clear()
+        keys = list(self.redis.scan_iter(match=f"{self.key_prefix}:*"))
+        return self.redis.delete(*keys) if keys else 0
+
+    def clear(self, key: str) -> None:
+        with self._lock:
+            self._counters.pop(key, None)
+            self._dirty.pop(key, None)
+        self.redis.delete(self._redis_key(key))
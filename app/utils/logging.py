@@ -5,9 +5,12 @@ Provides Sentry-ready logging format and structured log output
 for production monitoring and debugging.
 """
 
+import atexit
+import copy
 import logging
+import queue
 import sys
-from logging.handlers import RotatingFileHandler
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from pathlib import Path
 from flask import Flask
 import json
@@ -57,12 +60,39 @@ class JSONFormatter(logging.Formatter):
         return json.dumps(log_data)
 
 
+class LocalQueueHandler(QueueHandler):
+    """
+    Queue handler for an in-process listener.
+    
+    Records never leave the process, so only the message is merged with its
+    arguments here. exc_info and extra fields stay on the record and are
+    formatted by the listener's handlers on the background thread.
+    """
+    
+    def prepare(self, record):
+        """
+        Snapshot the record's message before it is queued.
+        
+        Args:
+            record: LogRecord instance
+            
+        Returns:
+            Copy of the record with a pre-merged message
+        """
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+
 def setup_logging(app: Flask):
     """
     Configure logging for Flask application.
     
     Sets up both file and console logging with appropriate formatters
     based on environment (JSON for production, human-readable for development).
+    The handlers run on a QueueListener thread; request threads only enqueue
+    records.
     
     Args:
         app: Flask application instance
@@ -72,6 +102,7 @@ def setup_logging(app: Flask):
     
     # Remove default handlers
     app.logger.handlers = []
+    handlers = []
     
     # Console handler (always add)
     console_handler = logging.StreamHandler(sys.stdout)
@@ -87,7 +118,7 @@ def setup_logging(app: Flask):
             )
         )
     console_handler.setLevel(log_level)
-    app.logger.addHandler(console_handler)
+    handlers.append(console_handler)
     
     # File handler (if log file is configured)
     log_file = app.config.get('LOG_FILE')
@@ -103,7 +134,14 @@ def setup_logging(app: Flask):
         # Always use JSON format for file logs
         file_handler.setFormatter(JSONFormatter())
         file_handler.setLevel(log_level)
-        app.logger.addHandler(file_handler)
+        handlers.append(file_handler)
+    
+    # Formatting and I/O happen on the listener thread
+    log_queue = queue.SimpleQueue()
+    listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    listener.start()
+    atexit.register(listener.stop)
+    app.logger.addHandler(LocalQueueHandler(log_queue))
     
     # Set application logger level
     app.logger.setLevel(log_level)
@@ -7,12 +7,26 @@ for API endpoints and user actions.
 
 from flask import request, current_app
 from flask_redis import FlaskRedis
+from functools import lru_cache
 from typing import Optional, Tuple
+import base64
+import hashlib
 import time
 import json
 from datetime import timedelta
 
 
+# Atomically increment a window counter, starting its expiry on the first hit.
+# Returns {count, ttl_seconds}.
+FIXED_WINDOW_INCR_SCRIPT = """
+local count = redis.call('INCR', KEYS[1])
+if count == 1 then
+    redis.call('EXPIRE', KEYS[1], ARGV[1])
+end
+return {count, redis.call('TTL', KEYS[1])}
+"""
+
+
 class RateLimiter:
     """
     Redis-based rate limiter implementation.
@@ -30,6 +44,7 @@ class RateLimiter:
             redis_client: FlaskRedis client instance
         """
         self.redis = redis_client
+        self._incr_expire = None  # Registered on first use (needs an initialized client)
     
     def check_rate_limit(
         self,
@@ -62,33 +77,20 @@ class RateLimiter:
         Fixed window rate limiting algorithm.
         
         Simple and efficient, but can allow bursts at window boundaries.
+        The counter is incremented and its expiry set by a server-side Lua
+        script, so each check is a single atomic Redis round trip.
         """
         redis_key = f"ratelimit:fixed:{key}"
-        current_time = int(time.time())
-        window_start = current_time - (current_time % window_seconds)
         
-        # Get current count
-        count = self.redis.get(redis_key)
-        if count is None:
-            count = 0
-        else:
-            count = int(count)
+        if self._incr_expire is None:
+            self._incr_expire = self.redis.register_script(FIXED_WINDOW_INCR_SCRIPT)
+        count, ttl = self._incr_expire(keys=[redis_key], args=[window_seconds])
         
-        # Check if limit exceeded
-        if count >= max_requests:
-            reset_time = window_start + window_seconds
+        reset_time = int(time.time()) + max(int(ttl), 0)
+        if count > max_requests:
             return False, 0, reset_time
         
-        # Increment counter
-        pipe = self.redis.pipeline()
-        pipe.incr(redis_key)
-        pipe.expire(redis_key, window_seconds)
-        pipe.execute()
-        
-        remaining = max(0, max_requests - count - 1)
-        reset_time = window_start + window_seconds
-        
-        return True, remaining, reset_time
+        return True, max_requests - count, reset_time
     
     def _token_bucket(self, key: str, max_tokens: int, refill_seconds: int) -> Tuple[bool, int, int]:
         """
@@ -173,3 +175,29 @@ def get_client_ip() -> str:
         ip = request.remote_addr or 'unknown'
     
     return ip
+
+
+@lru_cache(maxsize=4)
+def _rate_limit_hash_key(secret_key: str) -> bytes:
+    """Derive the BLAKE2b key for rate limit identifiers from SECRET_KEY."""
+    return hashlib.blake2b(secret_key.encode(), digest_size=32, person=b'radar-ratelimit').digest()
+
+
+def get_rate_limit_key() -> str:
+    """
+    Get the Flask-Limiter key for the current client.
+    
+    The remote address is hashed with keyed BLAKE2b into a fixed 22-character
+    identifier, so limiter keys in Redis stay short and the same length for
+    every client, and raw addresses are not stored there.
+    
+    Returns:
+        URL-safe base64 digest of the client address
+    """
+    address = request.remote_addr or '127.0.0.1'
+    digest = hashlib.blake2b(
+        address.encode(),
+        digest_size=16,
+        key=_rate_limit_hash_key(current_app.config['SECRET_KEY'])
+    ).digest()
+    return base64.urlsafe_b64encode(digest).rstrip(b'=').decode()
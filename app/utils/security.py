@@ -9,9 +9,11 @@ from cryptography.fernet import Fernet
 from cryptography.hazmat.primitives import hashes
 from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
 from cryptography.hazmat.backends import default_backend
+from flask import current_app
 import base64
 import bleach
 import re
+import threading
 from typing import Optional
 
 
@@ -123,33 +125,41 @@ class SecurityManager:
         return self._key.decode()
 
 
-# Global security manager instance (initialized in app factory)
+# Global security manager instance (created on first use)
 _security_manager: Optional[SecurityManager] = None
+_security_manager_lock = threading.Lock()
 
 
 def init_security_manager(encryption_key: str):
     """
-    Initialize global security manager.
+    Initialize global security manager with an explicit key.
     
     Args:
         encryption_key: Encryption key from configuration
     """
     global _security_manager
-    _security_manager = SecurityManager(encryption_key)
+    with _security_manager_lock:
+        _security_manager = SecurityManager(encryption_key)
 
 
 def get_security_manager() -> SecurityManager:
     """
     Get global security manager instance.
     
+    Created on first access from the current app's ENCRYPTION_KEY, so
+    workers that never encrypt or decrypt anything skip the setup.
+    
     Returns:
         SecurityManager instance
     
     Raises:
-        RuntimeError: If security manager not initialized
+        RuntimeError: If called before initialization outside an application context
     """
+    global _security_manager
     if _security_manager is None:
-        raise RuntimeError("Security manager not initialized. Call init_security_manager() first.")
+        with _security_manager_lock:
+            if _security_manager is None:
+                _security_manager = SecurityManager(current_app.config['ENCRYPTION_KEY'])
     return _security_manager
 
 
@@ -165,6 +175,37 @@ ALLOWED_ATTRIBUTES = {
     'code': ['class']
 }
 
+# Characters bleach rewrites (markup and C0 controls other than tab/newline);
+# input without any of them is returned unchanged without parsing
+_NEEDS_SANITIZING = re.compile(r'[<>&\x00-\x08\x0b-\x1f]')
+
+# bleach Cleaners hold parser state and are not thread-safe, so each thread
+# builds its own pair once instead of bleach.clean building one per call
+_cleaners = threading.local()
+
+
+def _get_cleaner(allow_html: bool) -> bleach.sanitizer.Cleaner:
+    """Return this thread's Cleaner for the given policy."""
+    cleaners = getattr(_cleaners, 'by_policy', None)
+    if cleaners is None:
+        cleaners = _cleaners.by_policy = {
+            True: bleach.sanitizer.Cleaner(tags=ALLOWED_TAGS, attributes=ALLOWED_ATTRIBUTES, strip=True),
+            False: bleach.sanitizer.Cleaner(tags=[], strip=True)
+        }
+    return cleaners[allow_html]
+
+
+_EMAIL_PATTERN = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
+
+_URL_PATTERN = re.compile(
+    r'^https?://'  # http:// or https://
+    r'(?:(?:[A-Z0-9](?:[A-Z0-9-]{0,61}[A-Z0-9])?\.)+[A-Z]{2,6}\.?|'  # domain...
+    r'localhost|'  # localhost...
+    r'\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3})'  # ...or ip
+    r'(?::\d+)?'  # optional port
+    r'(?:/?|[/?]\S+)$', re.IGNORECASE
+)
+
 
 def sanitize_input(data: str, allow_html: bool = False) -> str:
     """
@@ -180,19 +221,11 @@ def sanitize_input(data: str, allow_html: bool = False) -> str:
     if not isinstance(data, str):
         return str(data)
     
-    if allow_html:
-        # Allow safe HTML tags
-        sanitized = bleach.clean(
-            data,
-            tags=ALLOWED_TAGS,
-            attributes=ALLOWED_ATTRIBUTES,
-            strip=True
-        )
-    else:
-        # Strip all HTML
-        sanitized = bleach.clean(data, tags=[], strip=True)
+    if not _NEEDS_SANITIZING.search(data):
+        return data
     
-    return sanitized
+    # Allow safe HTML tags, or strip all HTML
+    return _get_cleaner(allow_html).clean(data)
 
 
 def sanitize_url(url: str) -> str:
@@ -214,16 +247,7 @@ def sanitize_url(url: str) -> str:
     url = url.strip()
     
     # Basic URL validation
-    url_pattern = re.compile(
-        r'^https?://'  # http:// or https://
-        r'(?:(?:[A-Z0-9](?:[A-Z0-9-]{0,61}[A-Z0-9])?\.)+[A-Z]{2,6}\.?|'  # domain...
-        r'localhost|'  # localhost...
-        r'\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3})'  # ...or ip
-        r'(?::\d+)?'  # optional port
-        r'(?:/?|[/?]\S+)$', re.IGNORECASE
-    )
-    
-    if not url_pattern.match(url):
+    if not _URL_PATTERN.match(url):
         raise ValueError(f"Invalid URL format: {url}")
     
     return url
@@ -242,8 +266,4 @@ def validate_email(email: str) -> bool:
     if not email:
         return False
     
-    email_pattern = re.compile(
-        r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-    )
-    
-    return bool(email_pattern.match(email.strip()))
+    return bool(_EMAIL_PATTERN.match(email.strip()))
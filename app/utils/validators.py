@@ -16,6 +16,24 @@ class ValidationError(Exception):
     pass
 
 
+# RFC 5322 compliant regex (simplified)
+_EMAIL_PATTERN = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
+
+# Password character class checks, in the order they are reported
+_PASSWORD_RULES = (
+    (re.compile(r'[A-Z]'), "Password must contain at least one uppercase letter"),
+    (re.compile(r'[a-z]'), "Password must contain at least one lowercase letter"),
+    (re.compile(r'\d'), "Password must contain at least one digit"),
+    (re.compile(r'[!@#$%^&*(),.?":{}|<>]'), "Password must contain at least one special character"),
+)
+# bcrypt only uses the first 72 bytes of a password
+_MAX_PASSWORD_BYTES = 72
+_COMMON_PASSWORDS = frozenset(['password', '123456', 'qwerty', 'abc123'])
+
+VALID_ROLES = ('CEO', 'CFO', 'Admin')
+_VALID_ROLE_SET = frozenset(VALID_ROLES)
+
+
 def validate_url(url: str, require_https: bool = True) -> str:
     """
     Validate and normalize URL.
@@ -72,12 +90,7 @@ def validate_email(email: str) -> str:
     
     email = email.strip().lower()
     
-    # RFC 5322 compliant regex (simplified)
-    pattern = re.compile(
-        r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-    )
-    
-    if not pattern.match(email):
+    if not _EMAIL_PATTERN.match(email):
         raise ValidationError(f"Invalid email format: {email}")
     
     # Additional checks
@@ -100,6 +113,7 @@ def validate_password(password: str, min_length: int = 12) -> str:
     
     Requires:
     - Minimum length (default 12)
+    - At most 72 bytes when UTF-8 encoded
     - At least one uppercase letter
     - At least one lowercase letter
     - At least one digit
@@ -121,21 +135,15 @@ def validate_password(password: str, min_length: int = 12) -> str:
     if len(password) < min_length:
         raise ValidationError(f"Password must be at least {min_length} characters long")
     
-    if not re.search(r'[A-Z]', password):
-        raise ValidationError("Password must contain at least one uppercase letter")
-    
-    if not re.search(r'[a-z]', password):
-        raise ValidationError("Password must contain at least one lowercase letter")
+    if len(password.encode('utf-8')) > _MAX_PASSWORD_BYTES:
+        raise ValidationError(f"Password must be at most {_MAX_PASSWORD_BYTES} bytes long")
     
-    if not re.search(r'\d', password):
-        raise ValidationError("Password must contain at least one digit")
-    
-    if not re.search(r'[!@#$%^&*(),.?":{}|<>]', password):
-        raise ValidationError("Password must contain at least one special character")
+    for pattern, message in _PASSWORD_RULES:
+        if not pattern.search(password):
+            raise ValidationError(message)
     
     # Check for common passwords (basic check)
-    common_passwords = ['password', '123456', 'qwerty', 'abc123']
-    if password.lower() in common_passwords:
+    if password.lower() in _COMMON_PASSWORDS:
         raise ValidationError("Password is too common. Please choose a stronger password")
     
     return password
@@ -154,15 +162,13 @@ def validate_role(role: str) -> str:
     Raises:
         ValidationError: If role is invalid
     """
-    valid_roles = ['CEO', 'CFO', 'Admin']
-    
     if not role or not isinstance(role, str):
         raise ValidationError("Role is required and must be a string")
     
     role = role.strip()
     
-    if role not in valid_roles:
-        raise ValidationError(f"Invalid role: {role}. Must be one of {valid_roles}")
+    if role not in _VALID_ROLE_SET:
+        raise ValidationError(f"Invalid role: {role}. Must be one of {list(VALID_ROLES)}")
     
     return role
 
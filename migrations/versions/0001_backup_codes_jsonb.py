@@ -0,0 +1,68 @@
+"""Store MFA backup codes as JSONB
+
+Revision ID: 0001_backup_codes_jsonb
+Revises: 
+Create Date: 2026-10-15 00:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = '0001_backup_codes_jsonb'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def _backup_codes_type():
+    """Current type of users.backup_codes, or None if the column is missing."""
+    inspector = sa.inspect(op.get_bind())
+    if 'users' not in inspector.get_table_names():
+        return None
+    for column in inspector.get_columns('users'):
+        if column['name'] == 'backup_codes':
+            return column['type']
+    return None
+
+
+def upgrade() -> None:
+    # Only PostgreSQL had a TEXT column to convert; elsewhere JSON is
+    # stored as text either way. Tables created by create_all() from the
+    # current models already have JSONB.
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    if isinstance(_backup_codes_type(), (type(None), postgresql.JSONB)):
+        return
+    
+    # Rows written before this change hold comma-joined sha256 hex digests
+    op.execute("""
+        ALTER TABLE users
+        ALTER COLUMN backup_codes TYPE jsonb
+        USING CASE
+            WHEN backup_codes IS NULL OR btrim(backup_codes) = '' THEN NULL
+            WHEN ltrim(backup_codes) LIKE '[%' THEN backup_codes::jsonb
+            ELSE to_jsonb(string_to_array(backup_codes, ','))
+        END
+    """)
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    if not isinstance(_backup_codes_type(), postgresql.JSONB):
+        return
+    
+    # ALTER ... USING cannot contain a subquery, so go through a new column
+    op.add_column('users', sa.Column('backup_codes_text', sa.Text()))
+    op.execute("""
+        UPDATE users
+        SET backup_codes_text = (
+            SELECT string_agg(code, ',') FROM jsonb_array_elements_text(backup_codes) AS code
+        )
+        WHERE jsonb_typeof(backup_codes) = 'array'
+    """)
+    op.drop_column('users', 'backup_codes')
+    op.alter_column('users', 'backup_codes_text', new_column_name='backup_codes')
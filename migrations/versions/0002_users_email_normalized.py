@@ -0,0 +1,77 @@
+"""Add generated users.email_normalized with a unique index
+
+Revision ID: 0002_users_email_normalized
+Revises: 0001_backup_codes_jsonb
+Create Date: 2026-10-15 00:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0002_users_email_normalized'
+down_revision = '0001_backup_codes_jsonb'
+branch_labels = None
+depends_on = None
+
+
+def _find_duplicate_emails(bind):
+    """Groups of user emails that collide once trimmed and lower-cased."""
+    rows = bind.execute(sa.text("""
+        SELECT lower(trim(email)) AS normalized, COUNT(*) AS total
+        FROM users
+        GROUP BY lower(trim(email))
+        HAVING COUNT(*) > 1
+        ORDER BY normalized
+    """)).fetchall()
+    return [(row.normalized, row.total) for row in rows]
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+    if 'users' not in inspector.get_table_names():
+        return
+
+    columns = {column['name'] for column in inspector.get_columns('users')}
+    indexes = {index['name'] for index in inspector.get_indexes('users')}
+
+    if 'idx_users_email_normalized' not in indexes:
+        # Case-variant duplicates belong to different users (passwords,
+        # companies, reports); merging them is not something to guess at.
+        duplicates = _find_duplicate_emails(bind)
+        if duplicates:
+            listed = ', '.join(f"{email} ({total} rows)" for email, total in duplicates[:20])
+            raise RuntimeError(
+                f"Cannot add unique idx_users_email_normalized: {len(duplicates)} email(s) "
+                f"differ only in case or whitespace: {listed}. Merge or rename these "
+                f"accounts, then re-run the migration."
+            )
+
+    if 'email_normalized' not in columns:
+        if bind.dialect.name == 'postgresql':
+            op.execute(
+                "ALTER TABLE users ADD COLUMN email_normalized VARCHAR(255) "
+                "GENERATED ALWAYS AS (lower(trim(email))) STORED"
+            )
+        else:
+            # SQLite can only add VIRTUAL generated columns to an existing table
+            op.execute(
+                "ALTER TABLE users ADD COLUMN email_normalized VARCHAR(255) "
+                "GENERATED ALWAYS AS (lower(trim(email))) VIRTUAL"
+            )
+
+    if 'idx_users_email_normalized' not in indexes:
+        op.create_index('idx_users_email_normalized', 'users', ['email_normalized'], unique=True)
+
+
+def downgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    if 'users' not in inspector.get_table_names():
+        return
+
+    if 'idx_users_email_normalized' in {index['name'] for index in inspector.get_indexes('users')}:
+        op.drop_index('idx_users_email_normalized', table_name='users')
+    if 'email_normalized' in {column['name'] for column in inspector.get_columns('users')}:
+        op.drop_column('users', 'email_normalized')
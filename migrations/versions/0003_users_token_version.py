@@ -0,0 +1,38 @@
+"""Add users.token_version
+
+Revision ID: 0003_users_token_version
+Revises: 0002_users_email_normalized
+Create Date: 2026-10-15 00:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0003_users_token_version'
+down_revision = '0002_users_email_normalized'
+branch_labels = None
+depends_on = None
+
+
+def _user_columns():
+    inspector = sa.inspect(op.get_bind())
+    if 'users' not in inspector.get_table_names():
+        return None
+    return {column['name'] for column in inspector.get_columns('users')}
+
+
+def upgrade() -> None:
+    columns = _user_columns()
+    if columns is None or 'token_version' in columns:
+        return
+    # server_default fills existing rows so the NOT NULL constraint holds
+    op.add_column('users', sa.Column('token_version', sa.Integer(), nullable=False, server_default='0'))
+
+
+def downgrade() -> None:
+    columns = _user_columns()
+    if columns is None or 'token_version' not in columns:
+        return
+    op.drop_column('users', 'token_version')
@@ -0,0 +1,39 @@
+"""Index users.locked_until
+
+Revision ID: 0004_users_locked_until_index
+Revises: 0003_users_token_version
+Create Date: 2026-10-15 00:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0004_users_locked_until_index'
+down_revision = '0003_users_token_version'
+branch_labels = None
+depends_on = None
+
+
+def _user_indexes():
+    inspector = sa.inspect(op.get_bind())
+    if 'users' not in inspector.get_table_names():
+        return None
+    return {index['name'] for index in inspector.get_indexes('users')}
+
+
+def upgrade() -> None:
+    indexes = _user_indexes()
+    if indexes is None or 'idx_users_locked_until' in indexes:
+        return
+    # Partial index: only locked accounts are indexed (PostgreSQL)
+    op.create_index('idx_users_locked_until', 'users', ['locked_until'],
+                    postgresql_where=sa.text('locked_until IS NOT NULL'))
+
+
+def downgrade() -> None:
+    indexes = _user_indexes()
+    if indexes is None or 'idx_users_locked_until' not in indexes:
+        return
+    op.drop_index('idx_users_locked_until', table_name='users')
@@ -0,0 +1,56 @@
+"""Composite indexes for company and competitor lookups
+
+Revision ID: 0005_company_competitor_composite_indexes
+Revises: 0004_users_locked_until_index
+Create Date: 2026-10-15 00:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0005_company_competitor_composite_indexes'
+down_revision = '0004_users_locked_until_index'
+branch_labels = None
+depends_on = None
+
+
+# (table, new composite index, its columns, single-column index it makes redundant)
+COMPOSITE_INDEXES = [
+    ('companies', 'idx_companies_user_website', ['user_id', 'website_url'], 'ix_companies_user_id'),
+    ('competitors', 'idx_competitors_company_website', ['company_id', 'website_url'], 'ix_competitors_company_id'),
+]
+
+
+def _indexes(inspector, table):
+    return {index['name'] for index in inspector.get_indexes(table)}
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    tables = set(inspector.get_table_names())
+    
+    for table, name, columns, redundant in COMPOSITE_INDEXES:
+        if table not in tables:
+            continue
+        indexes = _indexes(inspector, table)
+        if name not in indexes:
+            op.create_index(name, table, columns)
+        # The composite index leads with the same column
+        if redundant in indexes:
+            op.drop_index(redundant, table_name=table)
+
+
+def downgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    tables = set(inspector.get_table_names())
+    
+    for table, name, columns, redundant in COMPOSITE_INDEXES:
+        if table not in tables:
+            continue
+        indexes = _indexes(inspector, table)
+        if redundant not in indexes:
+            op.create_index(redundant, table, [columns[0]])
+        if name in indexes:
+            op.drop_index(name, table_name=table)
@@ -0,0 +1,46 @@
+"""Tests for the application factory."""
+
+import pytest
+from flask import url_for
+from app import create_app, load_blueprints, init_with_blueprints
+from app.config import TestingConfig
+
+
+class TestBlueprintLoading:
+    """Test blueprint registration."""
+    
+    def test_blueprints_registered_without_request(self, app):
+        """Test URL map is complete straight after create_app."""
+        with app.test_request_context():
+            assert url_for('auth.login') == '/api/auth/login'
+    
+    def test_lazy_blueprints_load_explicitly(self):
+        """Test lazily queued blueprints register on load_blueprints."""
+        app = create_app(TestingConfig, lazy_blueprints=True)
+        assert 'auth.login' not in app.view_functions
+        
+        load_blueprints(app)
+        
+        with app.test_request_context():
+            assert url_for('auth.login') == '/api/auth/login'
+    
+    def test_lazy_load_resumes_after_failure(self):
+        """Test a failing callback does not re-register loaded blueprints."""
+        app = create_app(TestingConfig, lazy_blueprints=True)
+        calls = []
+        
+        def flaky(app):
+            calls.append(app)
+            if len(calls) == 1:
+                raise RuntimeError('init failed')
+        
+        init_with_blueprints(app, flaky)
+        
+        with pytest.raises(RuntimeError):
+            load_blueprints(app)
+        
+        # Blueprints from the first attempt are not registered a second time
+        load_blueprints(app)
+        
+        assert len(calls) == 2
+        assert 'auth.login' in app.view_functions
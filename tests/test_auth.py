@@ -2,8 +2,10 @@
 
 import pytest
 from app.auth.models import User, UserRole
-from app.auth.services import AuthService
+from app.auth.passwords import hash_password, verify_password
+from app.auth.services import AuthService, _USER_CACHE
 from app.extensions import db
+from sqlalchemy import text
 
 
 class TestAuthService:
@@ -90,3 +92,103 @@ class TestUserModel:
             assert user.has_role(UserRole.CEO) is True
             assert user.has_role(UserRole.CFO) is False
             assert user.is_admin() is False
+    
+    def test_bcrypt_long_password_not_truncated(self, app):
+        """Test passwords over bcrypt's 72-byte limit are never hashed or matched."""
+        app.config.update(PASSWORD_HASHER='bcrypt', BCRYPT_LOG_ROUNDS=4)
+        prefix = 'Aa1!' * 18  # exactly 72 bytes
+        with app.app_context():
+            with pytest.raises(ValueError):
+                hash_password(prefix + 'extra')
+            
+            password_hash = hash_password(prefix)
+            assert verify_password(password_hash, prefix) is True
+            assert verify_password(password_hash, prefix + 'extra') is False
+    
+    def test_long_password_keeps_legacy_hash(self, app):
+        """Test a long password hashed before bcrypt still verifies on its full length."""
+        long_password = 'Aa1!' * 25  # 100 bytes
+        with app.app_context():
+            user = User(
+                email='long@example.com',
+                first_name='Long',
+                last_name='Password',
+                role=UserRole.CEO,
+                password=long_password
+            )
+            legacy_hash = user.password_hash
+            app.config.update(PASSWORD_HASHER='bcrypt', BCRYPT_LOG_ROUNDS=4)
+            
+            assert user.check_password(long_password) is True
+            assert user.password_hash == legacy_hash
+            assert user.check_password(long_password[:72] + 'different') is False
+    
+    def test_register_rejects_password_over_72_bytes(self, app):
+        """Test registration rejects passwords bcrypt would truncate."""
+        with app.app_context():
+            user, success, message = AuthService.register_user(
+                email='toolong@example.com',
+                password='Aa1!' + '\u00e9' * 35,  # 74 bytes, 39 characters
+                first_name='Too',
+                last_name='Long',
+                role='CEO'
+            )
+            
+            assert success is False
+            assert user is None
+
+
+class TestUserCache:
+    """Test the get_user_by_id cache."""
+    
+    def _create_user(self, email):
+        user = User(email=email, first_name='Cache', last_name='Test', role=UserRole.CEO)
+        db.session.add(user)
+        db.session.commit()
+        user_id = user.id
+        db.session.expunge_all()
+        return user_id
+    
+    def test_unflushed_edit_not_cached(self, app):
+        """Test an edited, rolled-back user is not served from the cache."""
+        with app.app_context():
+            user_id = self._create_user('unflushed@example.com')
+            
+            user = db.session.get(User, user_id)
+            user.role = UserRole.ADMIN
+            AuthService.get_user_by_id(user_id)
+            db.session.rollback()
+            db.session.expunge_all()
+            
+            assert AuthService.get_user_by_id(user_id).role == UserRole.CEO
+    
+    def test_rollback_invalidates_flushed_users(self, app):
+        """Test rolling back flushed changes drops the user from the cache."""
+        with app.app_context():
+            user_id = self._create_user('flushed@example.com')
+            
+            user = db.session.get(User, user_id)
+            user.role = UserRole.ADMIN
+            db.session.flush()
+            AuthService.get_user_by_id(user_id)
+            _USER_CACHE[user_id] = {'id': user_id, 'role': UserRole.ADMIN}
+            db.session.rollback()
+            
+            assert user_id not in _USER_CACHE
+    
+    def test_fresh_bypasses_cache(self, app):
+        """Test fresh=True reads changes the cache has not seen."""
+        with app.app_context():
+            user_id = self._create_user('fresh@example.com')
+            AuthService.get_user_by_id(user_id)
+            db.session.expunge_all()
+            
+            # Simulate another worker's write, which this process's listeners miss
+            db.session.connection().execute(
+                text("UPDATE users SET role = 'ADMIN' WHERE id = :id"), {'id': user_id}
+            )
+            db.session.commit()
+            
+            assert AuthService.get_user_by_id(user_id).role == UserRole.CEO
+            db.session.expunge_all()
+            assert AuthService.get_user_by_id(user_id, fresh=True).role == UserRole.ADMIN
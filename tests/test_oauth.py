@@ -0,0 +1,155 @@
+"""Tests for OAuth login."""
+
+import time
+import jwt
+import pytest
+from types import SimpleNamespace
+from cryptography.hazmat.primitives.asymmetric import rsa
+from app.auth.models import User, UserRole
+from app.auth.oauth import OAuthService, _verify_id_token, _google_issuer, _microsoft_issuer
+from app.extensions import db
+
+
+CLIENT_ID = 'radar-client-id'
+
+
+@pytest.fixture(scope='module')
+def signing_key():
+    """RSA key standing in for the provider's JWKS signing key."""
+    return rsa.generate_private_key(public_exponent=65537, key_size=2048)
+
+
+@pytest.fixture
+def jwks_client(signing_key):
+    """JWKS client that always resolves to the test signing key."""
+    key = SimpleNamespace(key=signing_key.public_key())
+    return SimpleNamespace(get_signing_key_from_jwt=lambda token: key)
+
+
+def make_id_token(signing_key, **overrides):
+    """Sign an ID token with valid Google claims, updated with overrides."""
+    now = int(time.time())
+    claims = {
+        'iss': 'https://accounts.google.com',
+        'aud': CLIENT_ID,
+        'sub': '1234567890',
+        'email': 'oauth@example.com',
+        'email_verified': True,
+        'iat': now,
+        'exp': now + 3600
+    }
+    claims.update(overrides)
+    return jwt.encode(claims, signing_key, algorithm='RS256')
+
+
+class TestVerifyIdToken:
+    """Test ID token verification."""
+    
+    def test_valid_token(self, signing_key, jwks_client):
+        """Test a correctly signed, current token returns its claims."""
+        claims = _verify_id_token(make_id_token(signing_key), jwks_client, CLIENT_ID, _google_issuer)
+        
+        assert claims['email'] == 'oauth@example.com'
+    
+    def test_rejects_wrong_issuer(self, signing_key, jwks_client):
+        """Test a token from another issuer is rejected."""
+        token = make_id_token(signing_key, iss='https://evil.example.com')
+        
+        assert _verify_id_token(token, jwks_client, CLIENT_ID, _google_issuer) is None
+    
+    def test_rejects_microsoft_issuer_for_other_tenant(self, signing_key, jwks_client):
+        """Test a Microsoft token whose issuer does not match its tenant is rejected."""
+        token = make_id_token(
+            signing_key,
+            tid='tenant-a',
+            iss='https://login.microsoftonline.com/tenant-b/v2.0'
+        )
+        
+        assert _verify_id_token(token, jwks_client, CLIENT_ID, _microsoft_issuer) is None
+    
+    def test_rejects_wrong_audience(self, signing_key, jwks_client):
+        """Test a token issued to another client is rejected."""
+        token = make_id_token(signing_key, aud='another-client')
+        
+        assert _verify_id_token(token, jwks_client, CLIENT_ID, _google_issuer) is None
+    
+    def test_rejects_expired_token(self, signing_key, jwks_client):
+        """Test an expired token is rejected."""
+        now = int(time.time())
+        token = make_id_token(signing_key, iat=now - 7200, exp=now - 3600)
+        
+        assert _verify_id_token(token, jwks_client, CLIENT_ID, _google_issuer) is None
+    
+    def test_rejects_token_without_expiry(self, signing_key, jwks_client):
+        """Test a token with no exp claim is rejected."""
+        token = make_id_token(signing_key, exp=None)
+        
+        assert _verify_id_token(token, jwks_client, CLIENT_ID, _google_issuer) is None
+
+
+class TestOAuthAccountLinking:
+    """Test linking OAuth identities to existing accounts."""
+    
+    def _create_password_user(self):
+        user = User(
+            email='existing@example.com',
+            first_name='Existing',
+            last_name='User',
+            role=UserRole.CEO,
+            password='ExistingPassword123!'
+        )
+        db.session.add(user)
+        db.session.commit()
+        return user
+    
+    def test_unverified_email_does_not_link(self, app):
+        """Test an unverified provider email cannot sign in to an existing account."""
+        with app.app_context():
+            self._create_password_user()
+            
+            user, success, message = OAuthService.create_or_update_user_from_oauth(
+                provider='microsoft',
+                oauth_id='attacker-oid',
+                email='Existing@example.com',
+                first_name='Mallory',
+                last_name='',
+                email_verified=False
+            )
+            
+            assert success is False
+            assert user is None
+            assert User.query.filter_by(email='existing@example.com').one().oauth_provider is None
+    
+    def test_verified_email_links_existing_account(self, app):
+        """Test a verified provider email links the existing account."""
+        with app.app_context():
+            existing = self._create_password_user()
+            
+            user, success, message = OAuthService.create_or_update_user_from_oauth(
+                provider='google',
+                oauth_id='google-sub',
+                email='existing@example.com',
+                first_name='Existing',
+                last_name='User',
+                email_verified=True
+            )
+            
+            assert success is True
+            assert user.id == existing.id
+            assert user.oauth_provider == 'google'
+    
+    def test_unverified_email_creates_new_account(self, app):
+        """Test an unverified email still creates a fresh, unverified account."""
+        with app.app_context():
+            user, success, message = OAuthService.create_or_update_user_from_oauth(
+                provider='microsoft',
+                oauth_id='new-oid',
+                email='new@example.com',
+                first_name='New',
+                last_name='User',
+                email_verified=False
+            )
+            
+            assert success is True
+            assert user.oauth_id == 'new-oid'
+            assert user.is_verified is False
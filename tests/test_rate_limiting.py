@@ -0,0 +1,90 @@
+"""Tests for the batched Redis rate limit storage."""
+
+import time
+import fakeredis
+import pytest
+import redis
+from unittest import mock
+from limits import parse
+from limits.strategies import FixedWindowRateLimiter
+from app.utils.limiter_storage import BatchedRedisStorage
+
+
+@pytest.fixture
+def redis_server():
+    """In-memory Redis server shared by every storage in a test."""
+    return fakeredis.FakeServer()
+
+
+@pytest.fixture
+def make_storage(redis_server):
+    """Build storages backed by the fake server (one per simulated worker)."""
+    def make(**options):
+        client = fakeredis.FakeRedis(server=redis_server)
+        with mock.patch('app.utils.limiter_storage.redis.from_url', return_value=client):
+            # A long interval keeps the background flusher out of the way
+            return BatchedRedisStorage('batched+redis://localhost:6379/0', flush_interval=3600, **options)
+    return make
+
+
+class TestBatchedRedisStorage:
+    """Test BatchedRedisStorage."""
+    
+    def test_rejects_over_limit_within_staleness_window(self, make_storage):
+        """Test hits counted locally are still rejected once over the limit."""
+        storage = make_storage(max_staleness=60)
+        limiter = FixedWindowRateLimiter(storage)
+        limit = parse('3/minute')
+        
+        assert [limiter.hit(limit, 'client') for _ in range(4)] == [True, True, True, False]
+        # Only the first (cold) hit went to Redis; the rest are unflushed
+        assert int(storage.redis.get(storage._redis_key(limit.key_for('client')))) == 1
+        
+        storage.flush()
+        
+        assert int(storage.redis.get(storage._redis_key(limit.key_for('client')))) == 4
+    
+    def test_counts_hits_from_other_workers(self, make_storage):
+        """Test a synced count includes hits flushed by another process."""
+        worker_a = make_storage(max_staleness=60)
+        worker_b = make_storage(max_staleness=60)
+        
+        worker_a.incr('key', 60)
+        worker_a.incr('key', 60, amount=2)
+        worker_a.flush()
+        
+        assert worker_b.incr('key', 60) == 4
+    
+    def test_failed_flush_keeps_hits(self, make_storage):
+        """Test hits from a failed flush are retried by the next one."""
+        storage = make_storage(max_staleness=60)
+        storage.incr('key', 60)
+        storage.incr('key', 60)
+        storage.incr('key', 60)
+        
+        broken_pipe = mock.MagicMock()
+        broken_pipe.execute.side_effect = redis.ConnectionError('down')
+        with mock.patch.object(storage.redis, 'pipeline', return_value=broken_pipe):
+            with pytest.raises(redis.ConnectionError):
+                storage.flush()
+        
+        assert storage.get('key') == 3
+        
+        storage.flush()
+        
+        assert int(storage.redis.get(storage._redis_key('key'))) == 3
+    
+    def test_window_expiry(self, make_storage):
+        """Test the counter expires with its window and then starts over."""
+        storage = make_storage(max_staleness=60)
+        
+        assert storage.incr('key', 1) == 1
+        assert storage.incr('key', 1) == 2
+        assert 0 < storage.redis.pttl(storage._redis_key('key')) <= 1000
+        assert storage.get_expiry('key') <= time.time() + 1
+        
+        time.sleep(1.1)
+        
+        assert storage.incr('key', 1) == 1
+        storage.flush()
+        assert int(storage.redis.get(storage._redis_key('key'))) == 1
@@ -6,7 +6,8 @@ This module creates the Flask application instance for production deployment.
 
 from app import create_app
 
-app = create_app()
+# Blueprints are imported on the first request to keep worker boot fast
+app = create_app(lazy_blueprints=True)
 
 if __name__ == "__main__":
     app.run()